@@ -6,7 +6,7 @@ import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -15,30 +15,27 @@ from src.movement import Movement
 from src.personality_adapter import PersonalityAdapter, DEFAULT_PERSONA, load_persona_from_file
 from src.voice import Voice
 
-COMMAND_MOVE_MAP = {
-    'forward': 'forward',
-    'backward': 'backward',
-    'left': 'left',
-    'right': 'right',
-    'stop': 'stop',
-}
+
+def movement_dispatch(movement: Movement) -> Dict[str, Callable[[], None]]:
+    """Map spoken directives straight to the bound movement methods."""
+    return {
+        'forward': movement.move_forward,
+        'backward': movement.move_backward,
+        'left': movement.turn_left,
+        'right': movement.turn_right,
+        'stop': movement.stop,
+    }
 
 
 def apply_movement(movement: Movement, command: str) -> None:
-    if command == 'forward':
-        movement.move_forward()
-    elif command == 'backward':
-        movement.move_backward()
-    elif command == 'left':
-        movement.turn_left()
-    elif command == 'right':
-        movement.turn_right()
-    elif command == 'stop':
-        movement.stop()
+    action = movement_dispatch(movement).get(command)
+    if action:
+        action()
 
 
 def run_loop(voice: Voice, movement: Movement, adapter: PersonalityAdapter) -> None:
     logging.info("Attitude drive ready. Speak commands or type them in simulation mode.")
+    dispatch = movement_dispatch(movement)
     try:
         while True:
             command = voice.listen(timeout=5.0, phrase_time_limit=5.0)
@@ -48,10 +45,10 @@ def run_loop(voice: Voice, movement: Movement, adapter: PersonalityAdapter) -> N
             if normalized in ('quit', 'exit'):
                 voice.speak(adapter.apply("Signing off"))
                 break
-            move_cmd = COMMAND_MOVE_MAP.get(normalized)
-            if move_cmd:
-                apply_movement(movement, move_cmd)
-                voice.speak(adapter.apply(f"Directive acknowledged: {move_cmd}"))
+            action = dispatch.get(normalized)
+            if action:
+                action()
+                voice.speak(adapter.apply(f"Directive acknowledged: {normalized}"))
             else:
                 voice.speak(adapter.apply("Unrecognized directive"))
     except KeyboardInterrupt:
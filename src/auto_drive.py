@@ -3,12 +3,20 @@
 The AutoDriver combines the movement module with the distance sensor wrapper so
 we can run a simple obstacle avoidance routine. Designed to run both on actual
 hardware and in simulation.
+
+On hardware the loop is event driven: the sensor's threshold callbacks wake the
+driver as soon as the obstacle threshold is crossed. In simulation (or with
+sensors lacking edge support) the same wait simply times out every
+``poll_interval_s``.
 """
 
 from __future__ import annotations
 
 import logging
+import statistics
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Optional
 
@@ -17,6 +25,12 @@ from src.sensors import DistanceSensorWrapper
 
 LOGGER = logging.getLogger(__name__)
 
+# Avoidance runs as a small state machine advanced by step(), so the loop never
+# sleeps through a manoeuvre and stop() takes effect on the next tick.
+DRIVE = 'drive'
+REVERSE = 'reverse'
+TURN = 'turn'
+
 
 @dataclass
 class AutoDriveConfig:
@@ -26,6 +40,12 @@ class AutoDriveConfig:
     reverse_duration_s: float = 0.5
     turn_duration_s: float = 0.4
     poll_interval_s: float = 0.1
+    max_idle_s: float = 0.5  # upper bound between steps when edge callbacks are wired
+    near_margin_cm: float = 25.0  # within this of the threshold, poll every poll_interval_s
+    median_window: int = 3  # readings used to debounce ultrasonic glitches
+    max_turn_extensions: int = 3  # extra turn phases while the path stays blocked
+    min_valid_cm: float = 2.0  # HC-SR04 physical range
+    max_valid_cm: float = 400.0
 
 
 class AutoDriver:
@@ -44,38 +64,122 @@ class AutoDriver:
         self.config = config
         self.logger = logger or LOGGER
         self._running = False
+        self._event = threading.Event()
+        self._recent = deque(maxlen=max(1, config.median_window))
+        self._state = DRIVE
+        self._state_until = 0.0
+        self._turn_extensions = 0
+        # Set by the sensor's threshold callback: gpiozero has already debounced
+        # the crossing, so the next reading below the threshold is acted on at once.
+        self._edge = False
+        self._near = True
+        self._event_driven = self._wire_sensor_events()
 
     def step(self) -> None:
-        distance = self.sensor.distance_cm
-        self.logger.debug("AutoDriver distance=%.2f", distance)
-        if distance <= 0:
-            self.logger.warning("Distance sensor returned %.2f, ignoring", distance)
+        distance = self._read_distance()
+        if self._state != DRIVE:
+            self._advance_manoeuvre(distance)
+            return
+        edge, self._edge = self._edge, False
+        if distance is None:
             return
 
-        if distance < self.config.obstacle_threshold_cm:
+        threshold = self.config.obstacle_threshold_cm
+        self._near = distance < threshold + self.config.near_margin_cm
+        self._recent.append(distance)
+        if (edge and distance < threshold) or statistics.median(self._recent) < threshold:
             self._avoid_obstacle()
         else:
             self.movement.move_forward(self.config.speed)
 
+    @property
+    def state(self) -> str:
+        return self._state
+
     def _avoid_obstacle(self) -> None:
         self.logger.info("Obstacle detected. Executing avoidance routine.")
         self.movement.move_backward(self.config.reverse_speed)
-        time.sleep(self.config.reverse_duration_s)
-        self.movement.turn_right(self.config.speed)
-        time.sleep(self.config.turn_duration_s)
+        self._enter(REVERSE, self.config.reverse_duration_s)
+
+    def _read_distance(self) -> Optional[float]:
+        """Return the current reading, or None when it is outside the sensor's valid range."""
+        distance = self.sensor.distance_cm
+        self.logger.debug("AutoDriver distance=%.2f", distance)
+        if not self.config.min_valid_cm <= distance <= self.config.max_valid_cm:
+            self.logger.warning("Distance sensor returned %.2f, ignoring", distance)
+            return None
+        return distance
+
+    def _advance_manoeuvre(self, distance: Optional[float]) -> None:
+        """Move the avoidance routine on once the current phase has run its course.
+
+        The sensor is read on every tick; a turn that ends with the path still
+        blocked is extended (up to ``max_turn_extensions`` times).
+        """
+        if time.monotonic() < self._state_until:
+            return
+        if self._state == REVERSE:
+            self.movement.turn_right(self.config.speed)
+            self._turn_extensions = 0
+            self._enter(TURN, self.config.turn_duration_s)
+            return
+        blocked = distance is not None and distance < self.config.obstacle_threshold_cm
+        if blocked and self._turn_extensions < self.config.max_turn_extensions:
+            self._turn_extensions += 1
+            self.logger.info("Path still blocked at %.1f cm; extending turn", distance)
+            self.movement.turn_right(self.config.speed)
+            self._enter(TURN, self.config.turn_duration_s)
+            return
         self.movement.stop()
+        self._enter(DRIVE, 0.0)
+        # Readings from before the turn describe a different heading.
+        self._recent.clear()
+        self._edge = False
+
+    def _enter(self, state: str, duration_s: float) -> None:
+        self._state = state
+        self._state_until = time.monotonic() + duration_s
+
+    def _next_wait(self, idle_s: float) -> float:
+        if self._near:
+            # Close to the threshold an edge may never fire for a creeping obstacle,
+            # and the median needs fresh readings, so fall back to regular polling.
+            idle_s = min(idle_s, self.config.poll_interval_s)
+        if self._state == DRIVE:
+            return idle_s
+        return max(0.0, min(idle_s, self._state_until - time.monotonic()))
+
+    def _on_threshold(self) -> None:
+        self._edge = True
+        self._event.set()
+
+    def _wire_sensor_events(self) -> bool:
+        """Hook threshold crossings on the sensor, if it supports edge callbacks."""
+        watch = getattr(self.sensor, 'watch_threshold', None)
+        if watch is None:
+            return False
+        return watch(self.config.obstacle_threshold_cm, self._on_threshold)
+
+    def _unwire_sensor_events(self) -> None:
+        if self._event_driven:
+            self.sensor.watch_threshold(self.config.obstacle_threshold_cm, None)
+            self._event_driven = False
 
     def run(self) -> None:
         self._running = True
+        idle_s = self.config.max_idle_s if self._event_driven else self.config.poll_interval_s
         try:
             while self._running:
                 self.step()
-                time.sleep(self.config.poll_interval_s)
+                self._event.wait(timeout=self._next_wait(idle_s))
+                self._event.clear()
         finally:
             self.movement.stop()
 
     def stop(self) -> None:
         self._running = False
+        self._event.set()
         self.movement.stop()
+        self._unwire_sensor_events()
         if self._manage_sensor:
             self.sensor.close()
@@ -8,6 +8,7 @@ Works with real hardware (gpiozero) or in simulation mode.
 
 import argparse
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -23,11 +24,16 @@ def main(speed: float, threshold_cm: float, turn_time: float, simulate: bool, ec
     s = UltrasonicSensor(echo=echo if not simulate else None,
                          trigger=trigger if not simulate else None,
                          simulate=simulate)
-    mode = "HARDWARE" if getattr(m, '_hw', False) else "SIMULATION"
+    is_hw = not m.is_simulation
+    read = s.read_distance_cm
+    mode = "HARDWARE" if is_hw else "SIMULATION"
     print(f"Autonomy start ({mode}) speed={speed} threshold={threshold_cm}cm")
+    # Wake early on threshold crossings when the sensor supports it; otherwise this is a plain poll.
+    wake = threading.Event()
+    s.watch_threshold(threshold_cm, wake.set)
     try:
         while True:
-            d = s.read_distance_cm()
+            d = read()
             status = f"distance={d:.1f}cm" if d is not None else "distance=unknown"
             if d is not None and d < threshold_cm:
                 print(f"[AUTO] Obstacle close ({status}) -> stop & turn")
@@ -38,12 +44,14 @@ def main(speed: float, threshold_cm: float, turn_time: float, simulate: bool, ec
                 m.stop()
             else:
                 m.move_forward(speed)
-            if not getattr(m, '_hw', False):
+            if not is_hw:
                 print(f"[SIM] pos={m.position} dir={m.direction} {status}")
-            time.sleep(poll)
+            wake.wait(timeout=poll)
+            wake.clear()
     except KeyboardInterrupt:
         print("\nAutonomy stopped by user")
     finally:
+        s.watch_threshold(threshold_cm, None)
         m.stop()
 
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 import time
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +26,7 @@ class BatteryMonitor:
         self.config = config
         self.logger = logger or LOGGER
         self._ema: Optional[float] = None
+        self._alpha = max(0.0, min(1.0, config.smoothing))
         self._running = False
 
     @property
@@ -39,13 +40,30 @@ class BatteryMonitor:
         if self._ema is None:
             self._ema = reading
         else:
-            alpha = max(0.0, min(1.0, self.config.smoothing))
-            self._ema = alpha * reading + (1 - alpha) * self._ema
+            self._ema = self._alpha * reading + (1 - self._alpha) * self._ema
         self.logger.debug("Battery reading=%.2fV ema=%.2fV", reading, self._ema)
         return self._ema
 
+    def sample_many(self, count: int) -> List[float]:
+        """Take ``count`` readings back to back and return the EMA after each."""
+        alpha = self._alpha
+        keep = 1 - alpha
+        reader = self.reader
+        ema = self._ema
+        history: List[float] = []
+        for _ in range(count):
+            reading = reader()
+            if reading <= 0:
+                self.logger.warning("Battery monitor returned %.2fV", reading)
+            ema = reading if ema is None else alpha * reading + keep * ema
+            history.append(ema)
+        self._ema = ema
+        return history
+
     def classify(self) -> str:
-        voltage = self.sample()
+        return self._classify_voltage(self.sample())
+
+    def _classify_voltage(self, voltage: float) -> str:
         if voltage <= self.config.critical_voltage:
             return "critical"
         if voltage <= self.config.warn_voltage:
@@ -57,7 +75,7 @@ class BatteryMonitor:
         try:
             while self._running:
                 voltage = self.sample()
-                status = self.classify()
+                status = self._classify_voltage(voltage)
                 callback(status, voltage)
                 time.sleep(self.config.sample_interval_s)
         finally:
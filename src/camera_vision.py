@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import functools
 import logging
-from typing import Generator, Optional
+import queue
+import threading
+import time
+from typing import Any, Generator, List, Optional, Tuple
 
 try:  # pragma: no cover - OpenCV optional
     import cv2  # type: ignore
@@ -12,38 +16,189 @@ except Exception:  # pragma: no cover
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_FRAME_SIZE = (320, 240)
+# Pause between grab attempts while the camera keeps failing (e.g. unplugged).
+GRAB_RETRY_S = 0.1
+
 
 class CameraVision:
-    def __init__(self, device: int = 0, cascade_path: Optional[str] = None, *, simulate: bool = False) -> None:
+    def __init__(
+        self,
+        device: int = 0,
+        cascade_path: Optional[str] = None,
+        *,
+        simulate: bool = False,
+        detector_model: Optional[str] = None,
+        detect_every: int = 3,
+        frame_size: Tuple[int, int] = DEFAULT_FRAME_SIZE,
+        threaded: bool = True,
+    ) -> None:
+        if detect_every < 1:
+            raise ValueError("detect_every must be at least 1")
         self.device = device
         self.simulate = simulate or cv2 is None
         self.cascade_path = cascade_path or (cv2.data.haarcascades + 'haarcascade_frontalface_default.xml' if cv2 else '')
+        self.detect_every = detect_every
+        self.frame_size = frame_size
         self._capture = None
-        self._classifier = None
+        self._detector = None
+        self._frame_idx = 0
+        self._last_faces = 0
+        self._grabber: Optional[threading.Thread] = None
+        self._grab_running = False
+        self._buffers: List[Any] = [None, None]
+        self._free_slots: 'queue.Queue[int]' = queue.Queue()
+        self._ready_slots: 'queue.Queue[Optional[int]]' = queue.Queue()
+        # At most one failed-read marker (None) waits in _ready_slots at a time.
+        self._failure_queued = False
         if not self.simulate and cv2:
             self._capture = cv2.VideoCapture(device)
             if not self._capture.isOpened():
                 LOGGER.warning("Failed to open camera %s; switching to simulation", device)
                 self.simulate = True
             else:
-                self._classifier = cv2.CascadeClassifier(self.cascade_path)
+                self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, frame_size[0])
+                self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, frame_size[1])
+                if detector_model:
+                    self._detector = self._load_yunet(detector_model)
+                if threaded:
+                    self._start_grabber()
+
+    # ------------------------------------------------------------ capture thread
+
+    def _start_grabber(self) -> None:
+        """Double-buffer capture: a daemon thread fills one slot while we detect on the other."""
+        for slot in range(len(self._buffers)):
+            self._free_slots.put(slot)
+        self._grab_running = True
+        self._grabber = threading.Thread(target=self._grab_loop, daemon=True)
+        self._grabber.start()
+
+    def _grab_loop(self) -> None:  # pragma: no cover - requires a camera
+        while self._grab_running:
+            slot = self._claim_slot()
+            if slot is None:
+                continue
+            if not self._grab_running:
+                break
+            ok = self._capture.grab()
+            if ok:
+                # retrieve() writes into the existing array once shapes match, so no per-frame allocation
+                ok, image = self._capture.retrieve(self._buffers[slot])
+                if ok:
+                    self._buffers[slot] = image
+            if ok:
+                self._ready_slots.put(slot)
+                continue
+            self._free_slots.put(slot)
+            if not self._failure_queued:
+                self._failure_queued = True
+                self._ready_slots.put(None)
+            time.sleep(GRAB_RETRY_S)
+
+    def _claim_slot(self) -> Optional[int]:
+        """Prefer a free slot; if the consumer is behind, overwrite the unread frame instead of queuing."""
+        try:
+            return self._free_slots.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            stale = self._ready_slots.get_nowait()
+        except queue.Empty:
+            stale = None
+        if stale is not None:
+            return stale
+        # Dropped a failed-read marker (or found nothing); allow a new one to be queued.
+        self._failure_queued = False
+        try:
+            return self._free_slots.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    def _stop_grabber(self) -> None:
+        if self._grabber is None:
+            return
+        self._grab_running = False
+        self._free_slots.put(0)  # unblock the producer
+        self._grabber.join(timeout=1.0)
+        self._grabber = None
+
+    @functools.cached_property
+    def classifier(self):
+        """Haar cascade, parsed on first use so YuNet/raw-frame users never pay for it."""
+        if cv2 is None:
+            return None
+        # Let the Haar path run through OpenCL (T-API) when the platform has it.
+        if cv2.ocl.haveOpenCL():
+            cv2.ocl.setUseOpenCL(True)
+        return cv2.CascadeClassifier(self.cascade_path)
+
+    def _load_yunet(self, model_path: str):  # pragma: no cover - requires OpenCV + model file
+        factory = getattr(cv2, 'FaceDetectorYN', None)
+        if factory is None:
+            LOGGER.warning("cv2.FaceDetectorYN unavailable; using Haar cascade")
+            return None
+        try:
+            return factory.create(
+                model_path,
+                '',
+                self.frame_size,
+                0.6,
+                0.3,
+                5000,
+                cv2.dnn.DNN_BACKEND_OPENCV,
+                cv2.dnn.DNN_TARGET_CPU,
+            )
+        except Exception as exc:
+            LOGGER.warning("Failed to load YuNet model %s (%s); using Haar cascade", model_path, exc)
+            return None
 
     def frames(self) -> Generator[Optional['FrameResult'], None, None]:
+        """Yield a :class:`FrameResult` per frame, or ``None`` when a read fails.
+
+        With the capture thread running, ``raw_frame`` is borrowed from a reused
+        capture buffer: it stays valid until the generator is advanced, after
+        which the grabber may write the next frame into it. Copy it to keep it.
+        """
+        held: Optional[int] = None
         while True:
             if self.simulate:
                 yield FrameResult(faces=0)
                 continue
             assert cv2 and self._capture
-            ret, frame = self._capture.read()
+            if held is not None:
+                self._free_slots.put(held)
+                held = None
+            if self._grabber is not None:
+                held = self._ready_slots.get()
+                if held is None:
+                    self._failure_queued = False
+                ret = held is not None
+                frame = self._buffers[held] if ret else None
+            else:
+                ret, frame = self._capture.read()
             if not ret:
                 LOGGER.warning("Camera read failed")
                 yield None
                 continue
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self._classifier.detectMultiScale(gray, 1.3, 5) if self._classifier is not None else []
-            yield FrameResult(faces=len(faces), raw_frame=frame, grayscale=gray)
+            if self._frame_idx % self.detect_every == 0:
+                if self._detector is not None:
+                    self._last_faces = self._detect_yunet(frame)
+                else:
+                    # UMat keeps conversion + detection on the OpenCL path; degrades to CPU transparently.
+                    gray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+                    self._last_faces = len(self.classifier.detectMultiScale(gray, 1.3, 5))
+            self._frame_idx += 1
+            yield FrameResult(faces=self._last_faces, raw_frame=frame)
+
+    def _detect_yunet(self, frame) -> int:  # pragma: no cover - requires OpenCV + model file
+        height, width = frame.shape[:2]
+        self._detector.setInputSize((width, height))
+        _, faces = self._detector.detect(frame)
+        return 0 if faces is None else len(faces)
 
     def close(self) -> None:
+        self._stop_grabber()
         if self._capture:
             self._capture.release()
         if cv2:
@@ -51,10 +206,11 @@ class CameraVision:
 
 
 class FrameResult:
-    def __init__(self, *, faces: int, raw_frame=None, grayscale=None) -> None:
+    """Face count for one frame plus the frame itself (see :meth:`CameraVision.frames` on reuse)."""
+
+    def __init__(self, *, faces: int, raw_frame=None) -> None:
         self.faces = faces
         self.raw_frame = raw_frame
-        self.grayscale = grayscale
 
     def __repr__(self) -> str:
         return f"FrameResult(faces={self.faces})"
@@ -62,11 +218,13 @@ class FrameResult:
 
 def print_face_detection_loop(device: int = 0, simulate: bool = False) -> None:
     vision = CameraVision(device=device, simulate=simulate)
+    last_faces = -1
     try:
         for frame in vision.frames():
-            if frame is None:
+            if frame is None or frame.faces == last_faces:
                 continue
             LOGGER.info("Detected %s face(s)", frame.faces)
+            last_faces = frame.faces
     except KeyboardInterrupt:
         LOGGER.info("Stopping camera vision loop")
     finally:
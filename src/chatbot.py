@@ -8,14 +8,20 @@ instructions alongside dialogue.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import collections
+import functools
 import json
 import logging
+import math
 import os
+import queue
 import re
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -41,6 +47,21 @@ try:
 except Exception:
     _HAS_PYTTSX3 = False
 
+try:
+    from sentence_transformers import SentenceTransformer  # type: ignore[reportMissingImports]
+except Exception:
+    SentenceTransformer = None  # type: ignore
+
+try:
+    import uvloop  # type: ignore[reportMissingImports]
+except Exception:
+    uvloop = None  # type: ignore
+
+try:
+    from orjson import loads as _json_loads  # type: ignore[reportMissingImports]
+except Exception:
+    _json_loads = json.loads
+
 try:
     from vosk import Model, KaldiRecognizer  # type: ignore[reportMissingImports]
     import sounddevice as sd  # type: ignore[reportMissingImports]
@@ -61,90 +82,588 @@ CONTROL_SYSTEM_PROMPT = (
     " Vision values should be describe or describe:<object label>. Keep speech short and in character."
 )
 
+TTS_QUEUE_SIZE = 4
+# How long close_tts() lets queued speech finish before giving up on it.
+TTS_DRAIN_S = 10.0
+AUDIO_QUEUE_SIZE = 32
+VOSK_BLOCKSIZE = 4000
+# VOSK's Result() is always {"text": "..."}; a regex is cheaper than json.loads in the audio callback.
+_VOSK_TEXT_RE = re.compile(r'"text"\s*:\s*"([^"]*)"')
+OPENAI_TIMEOUT_S = 20.0
+
+
+def _env_limit(name: str, default: float = 0.0) -> float:
+    """Read a non-negative number from ``name``; unset or invalid means ``default``."""
+    raw = os.environ.get(name, '').strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        value = -1.0
+    if not math.isfinite(value) or value < 0:
+        LOGGER.warning('Ignoring %s env var (expected a non-negative number): %s', name, raw)
+        return default
+    return value
+
+
+# Account limits for the shared request limiter; 0 leaves that limit unchecked.
+OPENAI_RPM = _env_limit('OPENAI_RPM')
+OPENAI_TPM = _env_limit('OPENAI_TPM')
+BATCH_POLL_S = 30.0
+_BATCH_DONE_STATES = ('completed', 'failed', 'expired', 'cancelled')
+# Streamed replies are handed to TTS at sentence boundaries.
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+ATTITUDE_PROMPTS = {
+    'friendly': 'You are a friendly helpful robot assistant.',
+    'grumpy': 'You are a grumpy, curt robot that responds with attitude.',
+    'cheerful': 'You are a very cheerful and upbeat robot.',
+}
+
+# Offline replies per attitude, bound to str.format once at import.
+_FALLBACK_TEMPLATES: Dict[str, Callable[[str], str]] = {
+    'friendly': "I heard: {}. How can I help further?".format,
+    'grumpy': "Ugh. You said: {}. Figure it out yourself.".format,
+    'cheerful': "Sure! You said: {}. That's awesome! Here's an idea...".format,
+}
+
+REPLY_CACHE_SIZE = 256
+REPLY_CACHE_TTL_S = _env_limit('CHATBOT_REPLY_CACHE_TTL', 300.0)
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+CacheKey = Tuple[str, str, str]
+Embedder = Callable[[str], Sequence[float]]
+
+
+def _phrases(*phrases: str) -> 're.Pattern[str]':
+    """Compile a substring alternation so keyword checks are one regex scan."""
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases))
+
+
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_AUTONOMY_RE = _phrases('autonomy', 'auto', 'self drive')
+_AUTONOMY_STOP_RE = _phrases('stop', 'disable', 'off', 'halt')
+_FORWARD_RE = _phrases('forward', 'ahead', 'advance', 'move out')
+_BACKWARD_RE = _phrases('back', 'reverse', 'backward')
+_WAVE_RE = _phrases('wave', 'say hi', 'hello there')
+_REST_RE = _phrases('rest arms', 'hands down', 'relax arms')
+_GRAB_RE = _phrases('grab', 'grip', 'clamp', 'hold tight', 'pick up', 'pick it up')
+_LOOK_RE = _phrases(
+    'what do you see', 'what can you see', 'describe what you see', 'look around',
+    'spot anything', 'describe the room', 'anything you see', 'do you see',
+)
+_FIND_RE = _phrases('show me the', 'where is the', 'do you see the', 'find the')
+_RELEASE_RE = _phrases('release', 'drop', 'let go', 'open hand')
+_TOGGLE_GRIPPER_RE = _phrases('toggle gripper', 'toggle claw')
+
+# Checked in order; the first phrase present in the text names the object.
+OBJECT_LABELS: Tuple[Tuple[str, str], ...] = (
+    ('red cube', 'red_cube'),
+    ('green cube', 'green_cube'),
+    ('blue cube', 'blue_cube'),
+    ('cube', 'red_cube'),
+    ('block', 'red_cube'),
+    ('orange mug', 'orange_mug'),
+    ('orange cup', 'orange_mug'),
+    ('mug', 'orange_mug'),
+    ('coffee mug', 'orange_mug'),
+    ('black box', 'black_box'),
+    ('black cube', 'black_box'),
+)
+
+_SET_ARMS_RE = _phrases('set arms', 'set left arm', 'set right arm')
+# (pattern, left delta, right delta) for the relative arm phrases.
+_ARM_ADJUSTMENTS: Tuple[Tuple['re.Pattern[str]', float, float], ...] = (
+    (_phrases('raise left arm', 'lift left arm'), 0.2, 0.0),
+    (_phrases('lower left arm', 'drop left arm'), -0.2, 0.0),
+    (_phrases('raise right arm', 'lift right arm'), 0.0, 0.2),
+    (_phrases('lower right arm', 'drop right arm'), 0.0, -0.2),
+    (_phrases('raise both arms', 'arms up'), 0.2, 0.2),
+    (_phrases('arms down', 'lower both arms'), -0.2, -0.2),
+)
+
+_TUNING_RE = _phrases('speed', 'trim', 'motor', 'slow', 'fast')
+_SPEED_UP_RE = _phrases('increase speed', 'speed up', 'go faster')
+_SLOW_DOWN_RE = _phrases('decrease speed', 'slow down', 'go slower')
+_TRIM_RESET_RE = _phrases('reset trim', 'balance motors')
+_TRIM_LEFT_RE = _phrases('trim left', 'nudge left motor')
+_TRIM_RIGHT_RE = _phrases('trim right', 'nudge right motor')
+
+
+_OBJECT_PRIORITY = {phrase: index for index, (phrase, _) in enumerate(OBJECT_LABELS)}
+# A zero-width lookahead reports a match at every position, so phrases nested
+# inside others ('cube' in 'black cube') are still seen and table order decides.
+_OBJECT_RE = re.compile('(?=(%s))' % '|'.join(re.escape(phrase) for phrase, _ in OBJECT_LABELS))
+
+
+# One-word commands are common; these match what the full rule scan produces for them.
+_SINGLE_WORD_ACTIONS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    'stop': (('movement', 'stop'),),
+    'forward': (('movement', 'forward'),),
+    'back': (('movement', 'backward'),),
+    'backward': (('movement', 'backward'),),
+    'reverse': (('movement', 'backward'),),
+    'left': (('movement', 'left'),),
+    'right': (('movement', 'right'),),
+    'wave': (('gesture', 'wave'),),
+    'salute': (('gesture', 'salute'),),
+    'point': (('gesture', 'point'),),
+    'nod': (('gesture', 'nod'),),
+    'grab': (('gripper', 'close'),),
+    'release': (('gripper', 'open'),),
+    'drop': (('gripper', 'open'),),
+}
+
+
+def _clamp_unit(value: float) -> float:
+    return -1.0 if value < -1.0 else (1.0 if value > 1.0 else value)
+
+
+def _match_object(text: str) -> Optional[str]:
+    """Scan ``text`` once and return the label of the highest-priority phrase found."""
+    best: Optional[int] = None
+    for match in _OBJECT_RE.finditer(text):
+        index = _OBJECT_PRIORITY[match.group(1)]
+        if best is None or index < best:
+            best = index
+    return OBJECT_LABELS[best][1] if best is not None else None
+
+
+# Persona text is fixed for a session, so both strings are built once rather than per turn.
+@functools.lru_cache(maxsize=8)
+def _persona_context(persona_text: Optional[str]) -> Optional[str]:
+    return f"Persona background:\n{persona_text}" if persona_text else None
+
+
+@functools.lru_cache(maxsize=16)
+def _join_prompt(system_prompt: str, context: Optional[str]) -> str:
+    return f"{system_prompt}\n{context}" if context else system_prompt
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def load_embedder(model_name: Optional[str]) -> Optional[Embedder]:
+    """Return a sentence embedding function, or None when unavailable/disabled."""
+    if not model_name or SentenceTransformer is None:
+        return None
+    try:
+        model = SentenceTransformer(model_name)
+    except Exception as exc:  # pragma: no cover - model download/IO
+        LOGGER.warning("Semantic reply cache disabled (%s)", exc)
+        return None
+    return lambda text: model.encode(text).tolist()
+
+
+class RateLimiter:
+    """Token buckets for requests/min and tokens/min shared by every caller.
+
+    Overlapping turns wait here for capacity instead of tripping 429s and
+    dropping to the offline fallback. A limit of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 0.0,
+        tpm: float = 0.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._capacity = (max(0.0, rpm), max(0.0, tpm))
+        self._levels = list(self._capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request costing ``tokens`` fits; return the seconds waited."""
+        cost = (1.0, float(tokens))
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                elapsed, self._stamp = now - self._stamp, now
+                delay = 0.0
+                for index, capacity in enumerate(self._capacity):
+                    if not capacity:
+                        continue
+                    self._levels[index] = min(capacity, self._levels[index] + elapsed * capacity / 60.0)
+                    # A request larger than a full minute's budget waits for a full bucket.
+                    shortfall = min(cost[index], capacity) - self._levels[index]
+                    if shortfall > 0:
+                        delay = max(delay, shortfall * 60.0 / capacity)
+                if delay == 0.0:
+                    for index, capacity in enumerate(self._capacity):
+                        if capacity:
+                            self._levels[index] -= min(cost[index], capacity)
+                    return waited
+            self._sleep(delay)
+            waited += delay
+
+
+def _estimate_tokens(messages: Sequence[Dict[str, str]], max_tokens: int) -> int:
+    # ~4 characters per token is OpenAI's rule of thumb; the reply may use all of max_tokens.
+    return sum(len(message['content']) for message in messages) // 4 + max_tokens
+
+
+_OPENAI_LIMITER = RateLimiter(OPENAI_RPM, OPENAI_TPM)
+
+
+class ReplyCache:
+    """Bounded LRU cache with TTL for model replies.
+
+    Keys are ``(model, system prompt, normalised user text)``. A key is only
+    admitted on its second miss so one-off prompts do not evict the phrases
+    people actually repeat ("hello", "move forward"). When an ``embedder`` is
+    supplied, an exact miss falls back to the closest cached utterance for the
+    same model and prompt whose cosine similarity clears ``similarity``. Pass
+    ``semantic=False`` for replies that must only answer their exact utterance
+    (control replies carry robot actions: "turn left" must never replay
+    "turn right"). A TTL of 0 disables caching entirely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = REPLY_CACHE_SIZE,
+        ttl_s: float = REPLY_CACHE_TTL_S,
+        *,
+        embedder: Optional[Embedder] = None,
+        similarity: float = SEMANTIC_CACHE_THRESHOLD,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.embedder = embedder
+        self.similarity = similarity
+        self._entries: 'collections.OrderedDict[CacheKey, Tuple[float, str, Optional[Sequence[float]]]]' = (
+            collections.OrderedDict()
+        )
+        self._seen_once: 'collections.OrderedDict[CacheKey, None]' = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(system_prompt: str, user_text: str, model: str = '') -> CacheKey:
+        return model, system_prompt, user_text.strip().lower()
+
+    def get(self, key: CacheKey, *, semantic: bool = True) -> Optional[str]:
+        with self._lock:
+            reply = self._lookup(key)
+            if reply is not None or not semantic or self.embedder is None or not self._entries:
+                return reply
+        vector = self.embedder(key[2])
+        with self._lock:
+            return self._lookup_similar(key, vector)
+
+    def put(self, key: CacheKey, reply: str, *, semantic: bool = True) -> None:
+        if self.ttl_s <= 0:
+            return
+        with self._lock:
+            if key not in self._entries and key not in self._seen_once:
+                self._seen_once[key] = None
+                if len(self._seen_once) > self.max_entries:
+                    self._seen_once.popitem(last=False)
+                return
+        # Entries stored without a vector are never offered to similar lookups.
+        vector = self.embedder(key[2]) if semantic and self.embedder is not None else None
+        with self._lock:
+            self._seen_once.pop(key, None)
+            self._entries[key] = (time.monotonic(), reply, vector)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: CacheKey) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stamp, reply, _ = entry
+        if time.monotonic() - stamp > self.ttl_s:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return reply
+
+    def _lookup_similar(self, key: CacheKey, vector: Sequence[float]) -> Optional[str]:
+        best_key = None
+        best_score = self.similarity
+        now = time.monotonic()
+        for other, (stamp, _, other_vector) in self._entries.items():
+            if other[:2] != key[:2] or other_vector is None or now - stamp > self.ttl_s:
+                continue
+            score = _cosine(vector, other_vector)
+            if score >= best_score:
+                best_key, best_score = other, score
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][1]
+
 
 class Chatbot:
     def __init__(self, attitude: str = 'friendly', simulate: bool = False, *, control_mode: bool = False):
         self.attitude = attitude
         self.simulate = simulate
         self.control_mode = control_mode
+        self._system_prompt = ATTITUDE_PROMPTS.get(attitude, ATTITUDE_PROMPTS['friendly'])
+        # Read once; the key and model do not change during a session.
+        self._api_key = os.environ.get('OPENAI_API_KEY')
+        self._model = os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo')
+        self._use_openai = bool(_HAS_OPENAI and self._api_key)
+        self._canned_template = _FALLBACK_TEMPLATES.get(attitude, _FALLBACK_TEMPLATES['friendly'])
+        self._client = None
+        self._reply_cache = ReplyCache(embedder=load_embedder(os.environ.get('CHATBOT_SEMANTIC_CACHE_MODEL')))
+        self._system_messages: Dict[str, Dict[str, str]] = {}
+        self._stt_queue: 'queue.Queue[str]' = queue.Queue()
+        self._vosk_stream = None
+        # Audio blocks travel in preallocated buffers that the decoder hands back,
+        # so the audio callback never allocates; the pool size bounds the backlog.
+        self._audio_queue: 'queue.Queue[Optional[bytearray]]' = queue.Queue()
+        self._audio_pool: 'queue.Queue[bytearray]' = queue.Queue()
+        for _ in range(AUDIO_QUEUE_SIZE):
+            self._audio_pool.put(bytearray(VOSK_BLOCKSIZE * 2))
+        self._stt_thread: Optional[threading.Thread] = None
         self.tts_engine = None
         if _HAS_PYTTSX3 and not simulate:
             try:
                 self.tts_engine = pyttsx3.init()
             except Exception:
                 self.tts_engine = None
-
-    def speak(self, text: str) -> None:
+        # None is the worker's stop sentinel, queued by close_tts().
+        self._tts_queue: 'queue.Queue[Optional[str]]' = queue.Queue(maxsize=TTS_QUEUE_SIZE)
+        self._tts_thread: Optional[threading.Thread] = None
         if self.tts_engine:
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
-        else:
+            self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+            self._tts_thread.start()
+
+    def speak(self, text: str, *, block: bool = False) -> None:
+        """Queue ``text`` for playback and return without waiting for audio.
+
+        With ``block`` the call waits for room in the queue instead of dropping
+        the oldest utterance, so sentences of a streamed reply are never skipped.
+        """
+        if not self.tts_engine:
             print("[TTS]", text)
+            return
+        if block:
+            self._tts_queue.put(text)
+            return
+        while True:
+            try:
+                self._tts_queue.put_nowait(text)
+                return
+            except queue.Full:
+                # Drop the oldest utterance rather than letting speech lag behind the conversation.
+                try:
+                    self._tts_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _tts_worker(self) -> None:
+        while True:
+            text = self._tts_queue.get()
+            if text is None:
+                return
+            try:
+                self.tts_engine.say(text)
+                self.tts_engine.runAndWait()
+            except Exception as exc:  # pragma: no cover - engine specific
+                LOGGER.warning("Text-to-speech failed: %s", exc)
 
     def generate_reply(self, user_text: str) -> str:
-        prompt = self._build_prompt()
-        if _HAS_OPENAI and os.environ.get('OPENAI_API_KEY'):
+        if self._use_openai:
             try:
-                if _HAS_OPENAI_V1 and _OpenAIClient is not None:
-                    client = _OpenAIClient()
-                    resp = client.chat.completions.create(
-                        model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                        messages=[{'role': 'system', 'content': prompt}, {'role': 'user', 'content': user_text}],
-                        max_tokens=200,
-                    )
-                    return resp.choices[0].message.content.strip()
-                else:
-                    openai.api_key = os.environ.get('OPENAI_API_KEY')
-                    resp = openai.ChatCompletion.create(
-                        model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                        messages=[{'role': 'system', 'content': prompt}, {'role': 'user', 'content': user_text}],
-                        max_tokens=200,
-                    )
-                    return resp.choices[0].message.content.strip()
+                return self.chat_completion(self._build_prompt(), user_text, max_tokens=200)
             except Exception as exc:
                 LOGGER.warning("OpenAI call failed, falling back: %s", exc)
+        return self._canned_reply(user_text)
 
-        if self.attitude == 'grumpy':
-            return f"Ugh. You said: {user_text}. Figure it out yourself."
-        if self.attitude == 'cheerful':
-            return f"Sure! You said: {user_text}. That's awesome! Here's an idea..."
-        return f"I heard: {user_text}. How can I help further?"
+    def reply_sentences(
+        self,
+        user_text: str,
+        *,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 200,
+    ) -> Iterator[str]:
+        """Yield the reply to ``user_text`` one sentence at a time for TTS."""
+        emitted = False
+        if self._use_openai:
+            try:
+                for sentence in self.stream_completion(
+                    system_prompt or self._build_prompt(), user_text, max_tokens=max_tokens
+                ):
+                    emitted = True
+                    yield sentence
+            except Exception as exc:
+                LOGGER.warning("OpenAI call failed, falling back: %s", exc)
+        if not emitted:
+            yield self._canned_reply(user_text)
+
+    def _canned_reply(self, user_text: str) -> str:
+        return self._canned_template(user_text)
+
+    def chat_completion(
+        self,
+        system_prompt: str,
+        user_text: str,
+        *,
+        max_tokens: int = 200,
+        context: Optional[str] = None,
+        semantic_cache: bool = True,
+    ) -> str:
+        """Single OpenAI chat turn shared by every reply path.
+
+        ``context`` (persona background and the like) is sent as a second system
+        message so ``system_prompt`` stays a byte-identical prefix across calls.
+        ``semantic_cache=False`` limits cache hits to the exact utterance.
+        """
+        model = self._model
+        cache_key = ReplyCache.key(_join_prompt(system_prompt, context), user_text, model)
+        cached = self._reply_cache.get(cache_key, semantic=semantic_cache)
+        if cached is not None:
+            return cached
+        messages = self._messages(system_prompt, user_text, context)
+        self._wait_for_capacity(messages, max_tokens)
+        if _HAS_OPENAI_V1 and _OpenAIClient is not None:
+            resp = self._openai_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+            )
+        else:
+            openai.api_key = self._api_key
+            resp = openai.ChatCompletion.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                request_timeout=OPENAI_TIMEOUT_S,
+            )
+        reply = resp.choices[0].message.content.strip()
+        self._reply_cache.put(cache_key, reply, semantic=semantic_cache)
+        return reply
+
+    def stream_completion(
+        self,
+        system_prompt: str,
+        user_text: str,
+        *,
+        max_tokens: int = 200,
+        context: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Like :meth:`chat_completion` but yields complete sentences as tokens arrive.
+
+        Cached replies and the legacy SDK (no streaming client) yield the whole
+        reply as a single chunk.
+        """
+        model = self._model
+        cache_key = ReplyCache.key(_join_prompt(system_prompt, context), user_text, model)
+        cached = self._reply_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        if not (_HAS_OPENAI_V1 and _OpenAIClient is not None):
+            yield self.chat_completion(system_prompt, user_text, max_tokens=max_tokens, context=context)
+            return
+        messages = self._messages(system_prompt, user_text, context)
+        self._wait_for_capacity(messages, max_tokens)
+        stream = self._openai_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        parts: List[str] = []
+        pending = ''
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            *sentences, pending = _SENTENCE_END_RE.split(pending + delta)
+            for sentence in sentences:
+                if sentence.strip():
+                    yield sentence.strip()
+        if pending.strip():
+            yield pending.strip()
+        self._reply_cache.put(cache_key, ''.join(parts).strip())
 
     def generate_control_reply(self, user_text: str, *, persona_text: Optional[str] = None) -> Dict[str, Any]:
-        if _HAS_OPENAI and os.environ.get('OPENAI_API_KEY'):
-            system_prompt = CONTROL_SYSTEM_PROMPT
-            if persona_text:
-                system_prompt += f"\nPersona background:\n{persona_text}\n"
+        if self._use_openai:
+            context = _persona_context(persona_text)
             try:
-                if _HAS_OPENAI_V1 and _OpenAIClient is not None:
-                    client = _OpenAIClient()
-                    resp = client.chat.completions.create(
-                        model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                        messages=[
-                            {'role': 'system', 'content': system_prompt},
-                            {'role': 'user', 'content': user_text},
-                        ],
-                        max_tokens=250,
-                    )
-                    reply = resp.choices[0].message.content.strip()
-                else:
-                    openai.api_key = os.environ.get('OPENAI_API_KEY')
-                    resp = openai.ChatCompletion.create(
-                        model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                        messages=[
-                            {'role': 'system', 'content': system_prompt},
-                            {'role': 'user', 'content': user_text},
-                        ],
-                        max_tokens=250,
-                    )
-                    reply = resp.choices[0].message.content.strip()
+                # Exact matches only: a similar command ("turn right") must not replay these actions.
+                reply = self.chat_completion(
+                    CONTROL_SYSTEM_PROMPT, user_text, max_tokens=250, context=context, semantic_cache=False
+                )
                 parsed = self._parse_control_json(reply)
                 if parsed is not None:
                     return parsed
                 LOGGER.warning("Control JSON parse failed, reply=%s", reply)
             except Exception as exc:
                 LOGGER.warning("OpenAI control call failed, falling back: %s", exc)
+        return self._offline_control_reply(user_text)
 
+    def batch_generate_control(
+        self,
+        utterances: Sequence[str],
+        *,
+        persona_text: Optional[str] = None,
+        poll_s: float = BATCH_POLL_S,
+    ) -> List[Dict[str, Any]]:
+        """Run many control turns through the OpenAI Batch API.
+
+        Batches are billed at half price but may take up to 24h, so this is for
+        offline evaluation and persona tuning, not the interactive loop. Turns the
+        batch cannot answer fall back to keyword inference.
+        """
+        if not (_HAS_OPENAI_V1 and _OpenAIClient is not None and self._api_key):
+            return [self.generate_control_reply(text, persona_text=persona_text) for text in utterances]
+
+        model = self._model
+        context = _persona_context(persona_text)
+        lines = [
+            json.dumps({
+                'custom_id': str(index),
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': model,
+                    'messages': self._messages(CONTROL_SYSTEM_PROMPT, text, context),
+                    'max_tokens': 250,
+                },
+            })
+            for index, text in enumerate(utterances)
+        ]
+        client = self._openai_client()
+        upload = client.files.create(file=('control_batch.jsonl', '\n'.join(lines).encode('utf-8')), purpose='batch')
+        batch = client.batches.create(input_file_id=upload.id, endpoint='/v1/chat/completions', completion_window='24h')
+        while batch.status not in _BATCH_DONE_STATES:
+            time.sleep(poll_s)
+            batch = client.batches.retrieve(batch.id)
+
+        replies: Dict[int, str] = {}
+        if batch.status == 'completed' and batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                choices = ((record.get('response') or {}).get('body') or {}).get('choices') or []
+                if choices:
+                    replies[int(record['custom_id'])] = choices[0]['message']['content']
+        else:
+            LOGGER.warning("OpenAI batch %s finished with status %s", batch.id, batch.status)
+
+        results: List[Dict[str, Any]] = []
+        for index, text in enumerate(utterances):
+            parsed = self._parse_control_json(replies[index]) if index in replies else None
+            results.append(parsed if parsed is not None else self._offline_control_reply(text))
+        return results
+
+    def _offline_control_reply(self, user_text: str) -> Dict[str, Any]:
         actions = self._infer_actions(user_text)
         if actions:
             speech = self._fallback_speech(actions)
@@ -152,11 +671,18 @@ class Chatbot:
             speech = self.generate_reply(user_text)
         return {'speech': speech, 'actions': actions}
 
+    def wants_vision(self, user_text: str) -> bool:
+        """Cheap pre-check for turns that will need a camera pass (describe or grab)."""
+        text = user_text.lower()
+        return any(pattern.search(text) for pattern in (_LOOK_RE, _FIND_RE, _GRAB_RE))
+
     def _parse_control_json(self, reply: str) -> Optional[Dict[str, Any]]:
         try:
-            data = json.loads(reply)
+            data = _json_loads(reply)
         except Exception:
             return None
+        if not isinstance(data, dict):
+            return None
         speech = data.get('speech')
         actions = data.get('actions', [])
         if not isinstance(speech, str) or not isinstance(actions, list):
@@ -168,20 +694,27 @@ class Chatbot:
             typ = item.get('type')
             value = item.get('value')
             if isinstance(typ, str) and isinstance(value, str):
-                normalised.append({'type': typ.lower(), 'value': value.lower()})
+                # Interned so the master loop's handler lookup matches by identity.
+                normalised.append({'type': sys.intern(typ.lower()), 'value': value.lower()})
         return {'speech': speech, 'actions': normalised}
 
     def _infer_actions(self, user_text: str) -> List[Dict[str, str]]:
         text = user_text.lower()
+        shortcut = _SINGLE_WORD_ACTIONS.get(text.strip(' .!?'))
+        if shortcut is not None:
+            return [{'type': kind, 'value': value} for kind, value in shortcut]
+        return self._infer_rule_actions(text)
+
+    def _infer_rule_actions(self, text: str) -> List[Dict[str, str]]:
         actions: List[Dict[str, str]] = []
-        if any(word in text for word in ('autonomy', 'auto', 'self drive')):
-            if any(word in text for word in ('stop', 'disable', 'off', 'halt')):
+        if _AUTONOMY_RE.search(text):
+            if _AUTONOMY_STOP_RE.search(text):
                 actions.append({'type': 'autonomy', 'value': 'stop'})
             else:
                 actions.append({'type': 'autonomy', 'value': 'start'})
-        if any(word in text for word in ('forward', 'ahead', 'advance', 'move out')):
+        if _FORWARD_RE.search(text):
             actions.append({'type': 'movement', 'value': 'forward'})
-        if any(word in text for word in ('back', 'reverse', 'backward')):
+        if _BACKWARD_RE.search(text):
             actions.append({'type': 'movement', 'value': 'backward'})
         if 'left' in text and 'left arm' not in text:
             actions.append({'type': 'movement', 'value': 'left'})
@@ -189,64 +722,42 @@ class Chatbot:
             actions.append({'type': 'movement', 'value': 'right'})
         if 'stop' in text and not any(a['value'] == 'stop' for a in actions if a['type'] == 'movement'):
             actions.append({'type': 'movement', 'value': 'stop'})
-        if any(word in text for word in ('wave', 'wave your', 'say hi', 'hello there')):
+        if _WAVE_RE.search(text):
             actions.append({'type': 'gesture', 'value': 'wave'})
         if 'salute' in text:
             actions.append({'type': 'gesture', 'value': 'salute'})
-        if any(word in text for word in ('point', 'point at')):
+        if 'point' in text:
             actions.append({'type': 'gesture', 'value': 'point'})
-        if 'nod' in text or 'yes' in text and 'head' in text:
+        if 'nod' in text or ('yes' in text and 'head' in text):
             actions.append({'type': 'gesture', 'value': 'nod'})
-        if any(word in text for word in ('rest arms', 'hands down', 'relax arms')):
+        if _REST_RE.search(text):
             actions.append({'type': 'gesture', 'value': 'rest'})
-        object_labels = {
-            'red cube': 'red_cube',
-            'green cube': 'green_cube',
-            'blue cube': 'blue_cube',
-            'cube': 'red_cube',
-            'block': 'red_cube',
-            'orange mug': 'orange_mug',
-            'orange cup': 'orange_mug',
-            'mug': 'orange_mug',
-            'coffee mug': 'orange_mug',
-            'black box': 'black_box',
-            'black cube': 'black_box',
-        }
-        grab_keywords = ('grab', 'grip', 'clamp', 'hold tight', 'pick up', 'pick it up')
-        if any(word in text for word in grab_keywords):
-            selected = None
-            for phrase, label in object_labels.items():
-                if phrase in text:
-                    selected = label
-                    break
-            if selected:
-                actions.append({'type': 'task', 'value': f'grab:{selected}'})
+        wants_grab = _GRAB_RE.search(text) is not None
+        wants_look = _LOOK_RE.search(text) is not None
+        wants_find = _FIND_RE.search(text) is not None
+        target = _match_object(text) if wants_grab or wants_look or wants_find else None
+        if wants_grab:
+            if target:
+                actions.append({'type': 'task', 'value': f'grab:{target}'})
             actions.append({'type': 'gripper', 'value': 'close'})
-        if any(word in text for word in ('what do you see', 'what can you see', 'describe what you see', 'look around', 'spot anything', 'describe the room', 'anything you see', 'do you see')):
-            detail = None
-            for phrase, label in object_labels.items():
-                if phrase in text:
-                    detail = label
-                    break
-            if detail:
-                actions.append({'type': 'vision', 'value': f'describe:{detail}'})
+        if wants_look:
+            if target:
+                actions.append({'type': 'vision', 'value': f'describe:{target}'})
             else:
                 actions.append({'type': 'vision', 'value': 'describe'})
 
-        if any(word in text for word in ('show me the', 'where is the', 'do you see the', 'find the')):
-            for phrase, label in object_labels.items():
-                if phrase in text:
-                    actions.append({'type': 'vision', 'value': f'describe:{label}'})
-                    break
+        if wants_find and target:
+            actions.append({'type': 'vision', 'value': f'describe:{target}'})
 
-        if any(word in text for word in ('release', 'drop', 'let go', 'open hand')):
+        if _RELEASE_RE.search(text):
             actions.append({'type': 'gripper', 'value': 'open'})
-        if 'toggle gripper' in text or 'toggle claw' in text:
+        if _TOGGLE_GRIPPER_RE.search(text):
             actions.append({'type': 'gripper', 'value': 'toggle'})
 
-        arm_actions = self._infer_arm_actions(text)
+        numbers = [float(match) for match in _NUMBER_RE.findall(text)]
+        arm_actions = self._infer_arm_actions(text, numbers)
         actions.extend(arm_actions)
-        tuning_actions = self._infer_tuning_actions(text)
+        tuning_actions = self._infer_tuning_actions(text, numbers)
         actions.extend(tuning_actions)
         return actions
 
@@ -270,61 +781,47 @@ class Chatbot:
             return f"On it! {summary}!"
         return f"Executing {summary}."
 
-    def _infer_arm_actions(self, text: str) -> List[Dict[str, str]]:
+    def _infer_arm_actions(self, text: str, numbers: Sequence[float]) -> List[Dict[str, str]]:
         actions: List[Dict[str, str]] = []
         if 'arm' not in text:
             return actions
 
-        numbers = [float(match.group()) for match in re.finditer(r'-?\d+(?:\.\d+)?', text)]
-        clamp = lambda value: max(-1.0, min(1.0, value))
-
         def build_action(kind: str, left: float, right: float) -> None:
             actions.append({'type': 'arms', 'value': f'{kind}:{left:.3f}:{right:.3f}'})
 
-        if 'set arms' in text or 'set left arm' in text or 'set right arm' in text:
+        if _SET_ARMS_RE.search(text):
             if 'left' in text and 'right' in text and len(numbers) >= 2:
-                build_action('set', clamp(numbers[0]), clamp(numbers[1]))
+                build_action('set', _clamp_unit(numbers[0]), _clamp_unit(numbers[1]))
                 return actions
             if 'left' in text and numbers:
-                build_action('set_left', clamp(numbers[0]), 0.0)
+                build_action('set_left', _clamp_unit(numbers[0]), 0.0)
                 return actions
             if 'right' in text and numbers:
-                build_action('set_right', 0.0, clamp(numbers[0]))
+                build_action('set_right', 0.0, _clamp_unit(numbers[0]))
                 return actions
             if len(numbers) >= 2:
-                build_action('set', clamp(numbers[0]), clamp(numbers[1]))
+                build_action('set', _clamp_unit(numbers[0]), _clamp_unit(numbers[1]))
                 return actions
-        if any(phrase in text for phrase in ('raise left arm', 'lift left arm')):
-            build_action('adjust', 0.2, 0.0)
-        if any(phrase in text for phrase in ('lower left arm', 'drop left arm')):
-            build_action('adjust', -0.2, 0.0)
-        if any(phrase in text for phrase in ('raise right arm', 'lift right arm')):
-            build_action('adjust', 0.0, 0.2)
-        if any(phrase in text for phrase in ('lower right arm', 'drop right arm')):
-            build_action('adjust', 0.0, -0.2)
-        if 'raise both arms' in text or 'arms up' in text:
-            build_action('adjust', 0.2, 0.2)
-        if 'arms down' in text or 'lower both arms' in text:
-            build_action('adjust', -0.2, -0.2)
+        for pattern, left, right in _ARM_ADJUSTMENTS:
+            if pattern.search(text):
+                build_action('adjust', left, right)
         return actions
 
-    def _infer_tuning_actions(self, text: str) -> List[Dict[str, str]]:
+    def _infer_tuning_actions(self, text: str, numbers: Sequence[float]) -> List[Dict[str, str]]:
         actions: List[Dict[str, str]] = []
-        if not any(keyword in text for keyword in ('speed', 'trim', 'motor', 'slow', 'fast')):
+        if not _TUNING_RE.search(text):
             return actions
 
-        numbers = [float(match.group()) for match in re.finditer(r'-?\d+(?:\.\d+)?', text)]
-
         def add(action: str) -> None:
             actions.append({'type': 'tuning', 'value': action})
 
         first_number = numbers[0] if numbers else None
         if 'set speed' in text and first_number is not None:
             add(f'speed_set:{max(0.0, min(1.5, first_number)):.3f}')
-        if any(phrase in text for phrase in ('increase speed', 'speed up', 'go faster')):
+        if _SPEED_UP_RE.search(text):
             delta = first_number if first_number is not None else 0.1
             add(f'speed_adj:{max(0.01, abs(delta)):.3f}')
-        if any(phrase in text for phrase in ('decrease speed', 'slow down', 'go slower')):
+        if _SLOW_DOWN_RE.search(text):
             delta = first_number if first_number is not None else 0.1
             add(f'speed_adj:-{max(0.01, abs(delta)):.3f}')
 
@@ -332,31 +829,76 @@ class Chatbot:
             add(f'trim_set:left:{first_number:.3f}')
         if 'set right trim' in text and first_number is not None:
             add(f'trim_set:right:{first_number:.3f}')
-        if 'reset trim' in text or 'balance motors' in text:
+        if _TRIM_RESET_RE.search(text):
             add('trim_reset')
 
         default_delta = first_number if first_number is not None else 0.02
-        if 'trim left' in text or 'nudge left motor' in text:
+        if _TRIM_LEFT_RE.search(text):
             add(f'trim_adj:left:{default_delta:+.3f}')
-        if 'trim right' in text or 'nudge right motor' in text:
+        if _TRIM_RIGHT_RE.search(text):
             add(f'trim_adj:right:{default_delta:+.3f}')
 
         return actions
 
     def _build_prompt(self) -> str:
-        return {
-            'friendly': 'You are a friendly helpful robot assistant.',
-            'grumpy': 'You are a grumpy, curt robot that responds with attitude.',
-            'cheerful': 'You are a very cheerful and upbeat robot.',
-        }.get(self.attitude, 'You are a friendly helpful robot assistant.')
+        return self._system_prompt
+
+    def _system_message(self, system_prompt: str) -> Dict[str, str]:
+        # Only a handful of distinct prompts exist per session; reuse their message dicts.
+        # The user turn is built fresh because replies may be in flight on several threads.
+        message = self._system_messages.get(system_prompt)
+        if message is None:
+            message = self._system_messages[system_prompt] = {'role': 'system', 'content': system_prompt}
+        return message
+
+    def _messages(self, system_prompt: str, user_text: str, context: Optional[str] = None) -> List[Dict[str, str]]:
+        # The invariant prompt leads so the provider's prompt cache can reuse that prefix;
+        # anything that varies between sessions or turns follows it.
+        messages = [self._system_message(system_prompt)]
+        if context:
+            messages.append(self._system_message(context))
+        messages.append({'role': 'user', 'content': user_text})
+        return messages
+
+    def _wait_for_capacity(self, messages: Sequence[Dict[str, str]], max_tokens: int) -> None:
+        waited = _OPENAI_LIMITER.acquire(_estimate_tokens(messages, max_tokens))
+        if waited:
+            LOGGER.debug("Waited %.2fs for OpenAI rate limit capacity", waited)
+
+    def _openai_client(self):
+        # Created lazily so instances without an API key never touch the SDK.
+        if self._client is None:
+            self._client = _OpenAIClient(api_key=self._api_key, timeout=OPENAI_TIMEOUT_S)
+        return self._client
 
     def listen_stdin(self) -> str:
+        return self.read_stdin_line() or ''
+
+    def read_stdin_line(self) -> Optional[str]:
+        """Prompt and read one stripped line from stdin, or ``None`` at end of input."""
         print('Type a message and press Enter (or Ctrl-C to quit):')
-        return sys.stdin.readline().strip()
+        line = sys.stdin.readline()
+        return line.strip() if line else None
 
-    def listen_vosk(self, model_path: str = 'model') -> None:
+    def listen_vosk(self, model_path: str = 'model', timeout: Optional[float] = None) -> Optional[str]:
+        """Block until VOSK recognises an utterance (or ``timeout`` expires).
+
+        The microphone stream is opened on first use and kept running. Its
+        callback only copies audio blocks onto a queue; a worker thread runs the
+        Kaldi decode and pushes recognised text onto another, so there is no polling.
+        """
         if self.simulate:
             return None
+        if self._vosk_stream is None:
+            self._start_vosk_stream(model_path)
+        try:
+            text = self._stt_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        print('[STT]', text)
+        return text
+
+    def _start_vosk_stream(self, model_path: str) -> None:
         if not _HAS_VOSK:
             raise RuntimeError('vosk not available')
         if not os.path.exists(model_path):
@@ -370,18 +912,73 @@ class Chatbot:
 
         rec = KaldiRecognizer(model, samplerate)
         print('Listening (press Ctrl-C to stop)')
+        audio = self._audio_queue
+        pool = self._audio_pool
 
         def callback(indata, frames, time_info, status):
-            if rec.AcceptWaveform(indata.tobytes()):
-                res = rec.Result()
-                payload = json.loads(res)
-                text = payload.get('text', '')
+            # Runs on the audio thread: copy the block into a pooled buffer and return.
+            try:
+                buffer = pool.get_nowait()
+            except queue.Empty:
+                LOGGER.debug('STT worker is behind; dropping an audio block')
+                return
+            buffer[:] = indata
+            audio.put_nowait(buffer)
+
+        self._stt_thread = threading.Thread(target=self._stt_worker, args=(rec,), daemon=True)
+        self._stt_thread.start()
+        stream = sd.RawInputStream(
+            samplerate=samplerate, blocksize=VOSK_BLOCKSIZE, dtype='int16', channels=1, callback=callback
+        )
+        stream.start()
+        self._vosk_stream = stream
+
+    def _stt_worker(self, rec) -> None:
+        accepts_buffer = True
+        while True:
+            block = self._audio_queue.get()
+            if block is None:
+                return
+            try:
+                if accepts_buffer:
+                    try:
+                        final = rec.AcceptWaveform(block)
+                    except TypeError:
+                        # Older vosk builds only take bytes; pay for the copy from now on.
+                        accepts_buffer = False
+                        final = rec.AcceptWaveform(bytes(block))
+                else:
+                    final = rec.AcceptWaveform(bytes(block))
+            finally:
+                self._audio_pool.put(block)
+            if final:
+                match = _VOSK_TEXT_RE.search(rec.Result())
+                text = match.group(1) if match else ''
                 if text:
-                    print('[STT]', text)
+                    self._stt_queue.put(text)
+
+    def close_tts(self, timeout_s: float = TTS_DRAIN_S) -> None:
+        """Let queued speech finish (up to ``timeout_s``) and stop the TTS worker."""
+        if self._tts_thread is None:
+            return
+        deadline = time.monotonic() + timeout_s
+        try:
+            self._tts_queue.put(None, timeout=timeout_s)
+        except queue.Full:
+            LOGGER.warning("TTS queue still full at shutdown; dropping queued speech")
+        else:
+            self._tts_thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._tts_thread = None
 
-        with sd.RawInputStream(samplerate=samplerate, blocksize=8000, dtype='int16', channels=1, callback=callback):
-            while True:
-                time.sleep(0.1)
+    def close_vosk(self) -> None:
+        if self._vosk_stream is not None:
+            self._vosk_stream.stop()
+            self._vosk_stream.close()
+            self._vosk_stream = None
+        if self._stt_thread is not None:
+            self._audio_queue.put(None)
+            self._stt_thread.join(timeout=1.0)
+            self._stt_thread = None
 
 
 def main() -> None:
@@ -391,6 +988,7 @@ def main() -> None:
     parser.add_argument('--vosk-model', default='model', help='Path to VOSK model directory')
     parser.add_argument('--persona-file', default=None, help='Path to a persona file to use as system prompt')
     parser.add_argument('--control', action='store_true', help='Print structured control JSON instead of TTS')
+    parser.add_argument('--batch', default=None, help='File of utterances (one per line) to run through the Batch API')
     args = parser.parse_args()
 
     persona_text = None
@@ -403,47 +1001,102 @@ def main() -> None:
 
     bot = Chatbot(attitude=args.attitude, simulate=args.simulate, control_mode=args.control)
 
+    if args.batch:
+        with open(args.batch, 'r', encoding='utf-8') as handle:
+            utterances = [line.strip() for line in handle if line.strip()]
+        print(json.dumps(bot.batch_generate_control(utterances, persona_text=persona_text), indent=2))
+        return
+
+    if uvloop is not None:
+        uvloop.install()
     try:
-        while True:
-            if _HAS_VOSK and not args.simulate:
-                print('VOSK live capture not fully wired in this CLI demo; using stdin fallback.')
-            user = bot.listen_stdin()
-            if not user:
-                continue
-            if user.lower() in ('quit', 'exit'):
-                print('Goodbye')
-                break
-
-            if args.control:
-                payload = bot.generate_control_reply(user, persona_text=persona_text)
-                print(json.dumps(payload, indent=2))
-            elif persona_text and _HAS_OPENAI and os.environ.get('OPENAI_API_KEY'):
-                try:
-                    if _HAS_OPENAI_V1 and _OpenAIClient is not None:
-                        client = _OpenAIClient()
-                        resp = client.chat.completions.create(
-                            model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                            messages=[{'role': 'system', 'content': persona_text}, {'role': 'user', 'content': user}],
-                            max_tokens=300,
-                        )
-                        reply = resp.choices[0].message.content.strip()
-                    else:
-                        openai.api_key = os.environ.get('OPENAI_API_KEY')
-                        resp = openai.ChatCompletion.create(
-                            model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                            messages=[{'role': 'system', 'content': persona_text}, {'role': 'user', 'content': user}],
-                            max_tokens=300,
-                        )
-                        reply = resp.choices[0].message.content.strip()
-                except Exception as exc:
-                    print('OpenAI persona call failed, falling back:', exc)
-                    reply = bot.generate_reply(user)
-                bot.speak(reply)
-            else:
-                reply = bot.generate_reply(user)
-                bot.speak(reply)
+        asyncio.run(_chat_loop(bot, args, persona_text))
     except KeyboardInterrupt:
         print('\nInterrupted')
+    finally:
+        bot.close_tts()
+
+
+async def _chat_loop(bot: Chatbot, args: argparse.Namespace, persona_text: Optional[str]) -> None:
+    """Read the next message while the previous reply is still being fetched/spoken."""
+    if _HAS_VOSK and not args.simulate:
+        print('VOSK live capture not fully wired in this CLI demo; using stdin fallback.')
+    lines: 'asyncio.Queue[Optional[str]]' = asyncio.Queue()
+    threading.Thread(
+        target=_read_stdin_lines,
+        args=(bot, asyncio.get_running_loop(), lines),
+        name='stdin-reader',
+        daemon=True,
+    ).start()
+    pending: Optional[asyncio.Task] = None
+    while True:
+        user = await lines.get()
+        if user == '':
+            continue
+        if user is None or user.lower() in ('quit', 'exit'):
+            if pending is not None:
+                await pending
+            print('Goodbye')
+            break
+        pending = asyncio.create_task(_respond(bot, args, persona_text, user, pending))
+
+
+async def _respond(
+    bot: Chatbot,
+    args: argparse.Namespace,
+    persona_text: Optional[str],
+    user: str,
+    previous: Optional[asyncio.Task],
+) -> None:
+    if args.control:
+        payload = await asyncio.to_thread(bot.generate_control_reply, user, persona_text=persona_text)
+        if previous is not None:
+            await previous
+        print(json.dumps(payload, indent=2))
+        return
+    # Sentences are fetched as soon as the turn arrives but spoken in the order
+    # the turns were asked, starting before the model has finished the reply.
+    sentences: 'queue.Queue[Optional[str]]' = queue.Queue()
+    producer = asyncio.create_task(
+        asyncio.to_thread(
+            _pump_sentences,
+            bot.reply_sentences(user, system_prompt=persona_text, max_tokens=300 if persona_text else 200),
+            sentences,
+        )
+    )
+    if previous is not None:
+        await previous
+    while True:
+        sentence = await asyncio.to_thread(sentences.get)
+        if sentence is None:
+            break
+        await asyncio.to_thread(bot.speak, sentence, block=True)
+    await producer
+
+
+def _read_stdin_lines(bot: Chatbot, loop: asyncio.AbstractEventLoop, sink: 'asyncio.Queue[Optional[str]]') -> None:
+    """Feed stdin lines to the chat loop, ending with ``None`` at end of input.
+
+    A pending readline cannot be interrupted, so it runs on its own daemon
+    thread rather than asyncio's default executor, which ``asyncio.run`` joins
+    on Ctrl-C (and would then wait for the next Enter).
+    """
+    while True:
+        line = bot.read_stdin_line()
+        try:
+            loop.call_soon_threadsafe(sink.put_nowait, line)
+        except RuntimeError:  # event loop already closed
+            return
+        if line is None:
+            return
+
+
+def _pump_sentences(source: Iterator[str], sink: 'queue.Queue[Optional[str]]') -> None:
+    try:
+        for sentence in source:
+            sink.put(sentence)
+    finally:
+        sink.put(None)
 
 
 if __name__ == '__main__':
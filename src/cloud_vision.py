@@ -18,11 +18,14 @@ from __future__ import annotations
 
 import base64
 import logging
-from typing import Iterable, List, Optional
+import math
+from typing import Iterable, List, Optional, Sequence
 
 try:  # pragma: no cover - optional dependency
     import cv2
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except Exception:  # pragma: no cover - allow import without deps
     cv2 = None  # type: ignore
     requests = None  # type: ignore
@@ -34,11 +37,28 @@ _DEFAULT_FEATURES = ("OBJECT_LOCALIZATION",)
 
 DEFAULT_ENDPOINT = _DEFAULT_ENDPOINT
 DEFAULT_FEATURES = _DEFAULT_FEATURES
+# Object localisation works on normalised coordinates, so a small frame is enough
+# and the upload (base64 inflates it by 4/3) stays small.
+DEFAULT_MAX_EDGE = 640
+DEFAULT_JPEG_QUALITY = 70
+# (connect, read) seconds: fail fast when offline but give annotate time to run.
+REQUEST_TIMEOUT = (2.0, 10.0)
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Retries are capped and Retry-After is ignored so a call has a known worst case:
+# every attempt hitting both timeouts plus the backoff sleeps between attempts.
+REQUEST_RETRIES = 2
+REQUEST_BACKOFF_S = 0.3
+MAX_REQUEST_S = (REQUEST_RETRIES + 1) * sum(REQUEST_TIMEOUT) + sum(
+    REQUEST_BACKOFF_S * 2 ** attempt for attempt in range(REQUEST_RETRIES)
+)
 
 
 class GoogleVisionClient:
     """Capture frames and call the Google Cloud Vision API."""
 
+    # Upper bound on one detect() call, used by ObjectRecognizer to size its wait.
+    max_request_s = MAX_REQUEST_S
+
     def __init__(
         self,
         *,
@@ -47,6 +67,8 @@ class GoogleVisionClient:
         endpoint: str = _DEFAULT_ENDPOINT,
         features: Optional[Iterable[str]] = None,
         max_results: int = 10,
+        max_edge: int = DEFAULT_MAX_EDGE,
+        jpeg_quality: int = DEFAULT_JPEG_QUALITY,
     ) -> None:
         if cv2 is None or requests is None:
             raise RuntimeError(
@@ -57,6 +79,20 @@ class GoogleVisionClient:
         self.endpoint = endpoint
         self.features = tuple(features) if features else _DEFAULT_FEATURES
         self.max_results = max_results
+        self.max_edge = max_edge
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality), int(cv2.IMWRITE_JPEG_OPTIMIZE), 1]
+        # One keep-alive session per client so each detect() skips the TCP/TLS handshake.
+        # images:annotate has no side effects, so POSTs are safe to retry on transient errors.
+        self._session = requests.Session()
+        retry = Retry(
+            total=REQUEST_RETRIES,
+            backoff_factor=REQUEST_BACKOFF_S,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
         self.cap = cv2.VideoCapture(camera_index)
         if not self.cap or not self.cap.isOpened():
             raise RuntimeError(f"Failed to open camera index {camera_index}")
@@ -72,10 +108,9 @@ class GoogleVisionClient:
             angle_deg: float (rough heading)
         """
 
-        frame = self.snapshot_jpeg()
-        payload = self._build_payload(frame)
+        payload = self._build_payload(self._encode_snapshot())
         params = {'key': self.api_key}
-        resp = requests.post(self.endpoint, json=payload, params=params, timeout=10)
+        resp = self._session.post(self.endpoint, json=payload, params=params, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         return self._parse_response(data)
@@ -84,20 +119,35 @@ class GoogleVisionClient:
         if self.cap:
             self.cap.release()
             self.cap = None
+        self._session.close()
 
     # ----------------------------------------------------------------- helpers
 
     def snapshot_jpeg(self) -> bytes:
+        return self._encode_snapshot().tobytes()
+
+    def _encode_snapshot(self):
+        """Capture and JPEG-encode a frame, returning OpenCV's buffer without copying it."""
         ok, frame = self.cap.read()
         if not ok:
             raise RuntimeError("Failed to capture frame from camera")
-        ok, buffer = cv2.imencode('.jpg', frame)
+        height, width = frame.shape[:2]
+        longest = max(height, width)
+        if self.max_edge and longest > self.max_edge:
+            scale = self.max_edge / float(longest)
+            frame = cv2.resize(
+                frame,
+                (max(1, int(width * scale)), max(1, int(height * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+        ok, buffer = cv2.imencode('.jpg', frame, self._encode_params)
         if not ok:
             raise RuntimeError("Failed to encode frame to JPEG")
-        return buffer.tobytes()
+        return buffer.reshape(-1)
 
-    def _build_payload(self, frame_bytes: bytes) -> dict:
-        image_content = base64.b64encode(frame_bytes).decode('utf-8')
+    def _build_payload(self, jpeg) -> dict:
+        # b64encode reads any contiguous buffer, so the encoder's array goes in as-is.
+        image_content = base64.b64encode(jpeg).decode('ascii')
         feature_list = [
             {'type': feature, 'maxResults': self.max_results}
             for feature in self.features
@@ -126,9 +176,11 @@ class GoogleVisionClient:
                 continue
             if not vertices:
                 continue
-            center_x = sum(v.get('x', 0.0) for v in vertices) / len(vertices)
-            center_y = sum(v.get('y', 0.0) for v in vertices) / len(vertices)
-            area = self._polygon_area(vertices)
+            xs = [v.get('x', 0.0) for v in vertices]
+            ys = [v.get('y', 0.0) for v in vertices]
+            center_x = sum(xs) / len(xs)
+            center_y = sum(ys) / len(ys)
+            area = self._polygon_area(xs, ys)
             distance = self._estimate_distance(area)
             angle = (center_x - 0.5) * 90.0  # widen FOV to 90°
             detections.append(
@@ -144,16 +196,11 @@ class GoogleVisionClient:
         return detections
 
     @staticmethod
-    def _polygon_area(vertices: List[dict]) -> float:
-        if len(vertices) < 3:
+    def _polygon_area(xs: Sequence[float], ys: Sequence[float]) -> float:
+        # Shoelace formula over coordinates extracted once by the caller.
+        if len(xs) < 3:
             return 0.0
-        area = 0.0
-        for i in range(len(vertices)):
-            x1 = vertices[i].get('x', 0.0)
-            y1 = vertices[i].get('y', 0.0)
-            x2 = vertices[(i + 1) % len(vertices)].get('x', 0.0)
-            y2 = vertices[(i + 1) % len(vertices)].get('y', 0.0)
-            area += x1 * y2 - x2 * y1
+        area = sum(x1 * y2 - x2 * y1 for x1, y1, x2, y2 in zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1]))
         return abs(area) / 2.0
 
     @staticmethod
@@ -161,5 +208,5 @@ class GoogleVisionClient:
         # Normalised area is relative to the frame size (0..0.5 typical)
         if normalized_area <= 0:
             return 80.0
-        distance = 150.0 * (normalized_area ** -0.5)
+        distance = 150.0 / math.sqrt(normalized_area)
         return max(6.0, min(distance, 120.0))
@@ -2,28 +2,62 @@
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 import logging
+import threading
 import time
-from typing import Dict, Optional
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
 
 try:  # pragma: no cover - optional dependency
     from gpiozero import Servo
 except Exception:  # pragma: no cover
     Servo = None  # type: ignore
 
+from src.utils.servo import SERVO_DEADBAND, make_servo
+
 LOGGER = logging.getLogger(__name__)
 
-DEFAULT_GESTURES: Dict[str, tuple[float, float]] = {
+
+class Gesture(IntEnum):
+    """Named poses; callers holding one skip the string normalisation in ``perform``."""
+
+    REST = 0
+    WAVE = 1
+    POINT = 2
+    NOD = 3
+    SALUTE = 4
+
+
+DEFAULT_GESTURES: Mapping[str, tuple[float, float]] = MappingProxyType({
     'rest': (0.0, 0.0),
     'wave': (0.6, -0.6),
     'point': (-0.7, 0.7),
     'nod': (0.2, 0.2),
     'salute': (0.8, -0.2),
-}
+})
+_GESTURE_NAMES = tuple(gesture.name.lower() for gesture in Gesture)
+
+# Multi-step gestures as (offset seconds, scale of the target pose) keyframes.
+_KEYFRAMES: Mapping[str, tuple[tuple[float, float], ...]] = MappingProxyType({
+    'wave': ((0.0, 1.0), (0.15, 0.7), (0.35, 1.0)),
+})
+
+# Requests arriving faster than this are debounced and settled by majority vote
+# over those made within the vote window, so flapping labels do not thrash the servos.
+GESTURE_MIN_INTERVAL_S = 0.1
+GESTURE_VOTE_WINDOW_S = 0.5
+GESTURE_VOTE_SIZE = 5
 
 
 class GestureController:
-    """Drive two arm/hand servos with simple named poses."""
+    """Drive two arm/hand servos with simple named poses.
+
+    On the Pi, pulse widths go straight to pigpio's hardware timing when the
+    daemon is running (``sudo pigpiod``); otherwise gpiozero's software PWM is used.
+    """
 
     def __init__(
         self,
@@ -37,57 +71,124 @@ class GestureController:
         self.right_servo = None
         self._current_left = 0.0
         self._current_right = 0.0
+        # Gestures run on one worker so the caller never waits on servo moves;
+        # a newer command bumps the generation, which cancels queued or in-flight ones.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='gesture')
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._generation = 0
+        self._pending: Optional[concurrent.futures.Future] = None
+        self._recent: collections.deque = collections.deque(maxlen=GESTURE_VOTE_SIZE)
+        self._last_commit_ts = float('-inf')
         if not self.simulate and Servo:
             try:  # pragma: no cover - hardware specific
-                self.left_servo = Servo(left_servo_pin)
-                self.right_servo = Servo(right_servo_pin)
+                self.left_servo = make_servo(left_servo_pin)
+                self.right_servo = make_servo(right_servo_pin)
             except Exception as exc:  # pragma: no cover
                 LOGGER.warning("Failed to initialise servos, falling back to simulation: %s", exc)
                 self.simulate = True
         self.perform('rest')
 
     @property
-    def available_gestures(self) -> Dict[str, tuple[float, float]]:
+    def available_gestures(self) -> Mapping[str, tuple[float, float]]:
         return DEFAULT_GESTURES
 
-    def perform(self, gesture: str) -> None:
-        gesture = gesture.lower()
-        if gesture not in DEFAULT_GESTURES:
-            LOGGER.info("Unknown gesture '%s'; defaulting to rest", gesture)
-            gesture = 'rest'
-        LOGGER.info("Executing gesture: %s", gesture)
-        target = DEFAULT_GESTURES[gesture]
-        self._set_positions(*target)
-        if gesture == 'wave' and not self.simulate:
-            self._set_positions(target[0] * 0.7, target[1] * 0.7)
-            time.sleep(0.2)
-            self._set_positions(*target)
+    def perform(self, gesture: Union[str, Gesture]) -> concurrent.futures.Future:
+        """Queue ``gesture`` on the servo worker and return without waiting.
+
+        The returned future completes once the pose is reached (or superseded).
+        A request within ``GESTURE_MIN_INTERVAL_S`` of the last committed pose
+        waits out the interval, then the most requested recent gesture wins.
+        """
+        if isinstance(gesture, Gesture):
+            gesture = _GESTURE_NAMES[gesture]
+        else:
+            gesture = gesture.lower()
+            if gesture not in DEFAULT_GESTURES:
+                LOGGER.info("Unknown gesture '%s'; defaulting to rest", gesture)
+                gesture = 'rest'
+        LOGGER.debug("Executing gesture: %s", gesture)
+        with self._lock:
+            self._recent.append((time.monotonic(), gesture))
+            self._generation += 1
+            self._cancel.set()
+            future = self._executor.submit(self._run_gesture, self._generation)
+            self._pending = future
+        return future
 
     def set_positions(self, left: float, right: float) -> None:
         """Directly command servo positions (-1..1)."""
+        self._interrupt()
         self._set_positions(left, right)
 
     def adjust(self, left_delta: float = 0.0, right_delta: float = 0.0) -> None:
         """Apply deltas to the current servo positions."""
+        self._interrupt()
         self._set_positions(self._current_left + left_delta, self._current_right + right_delta)
 
     @property
     def positions(self) -> tuple[float, float]:
         return self._current_left, self._current_right
 
+    def _run_gesture(self, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._cancel.clear()
+            delay = self._last_commit_ts + GESTURE_MIN_INTERVAL_S - time.monotonic()
+        if delay > 0 and self._cancel.wait(delay):
+            return
+        with self._lock:
+            gesture = self._vote()
+            self._last_commit_ts = time.monotonic()
+        target = DEFAULT_GESTURES[gesture]
+        keyframes = _KEYFRAMES.get(gesture)
+        if keyframes and not self.simulate:
+            start = time.monotonic()
+            for offset, scale in keyframes:
+                # Waiting on the cancel event lets a newer command cut the sequence short.
+                due = start + offset - time.monotonic()
+                if due > 0 and self._cancel.wait(due):
+                    return
+                self._set_positions(target[0] * scale, target[1] * scale)
+        elif self.positions != target:
+            self._set_positions(*target)
+
+    def _vote(self) -> str:
+        """Most requested gesture in the vote window; ties go to the latest request."""
+        horizon = time.monotonic() - GESTURE_VOTE_WINDOW_S
+        names = [name for stamp, name in self._recent if stamp >= horizon] or [self._recent[-1][1]]
+        counts = collections.Counter(names)
+        best = max(counts.values())
+        return next(name for name in reversed(names) if counts[name] == best)
+
+    def _interrupt(self) -> None:
+        """Cancel queued gestures and wait for the worker to go idle."""
+        with self._lock:
+            self._generation += 1
+            self._cancel.set()
+            pending = self._pending
+        if pending is not None:
+            concurrent.futures.wait([pending])
+
     def _set_positions(self, left: float, right: float) -> None:
+        left = max(-1.0, min(1.0, left))
+        right = max(-1.0, min(1.0, right))
         if self.simulate:
             LOGGER.debug("[SIM] Servo positions left=%s right=%s", left, right)
         else:
-            if self.left_servo is not None:
-                self.left_servo.value = max(-1.0, min(1.0, left))
-            if self.right_servo is not None:
-                self.right_servo.value = max(-1.0, min(1.0, right))
-        self._current_left = max(-1.0, min(1.0, left))
-        self._current_right = max(-1.0, min(1.0, right))
+            # gpiozero servos start at 0.0, matching the initial _current_* values,
+            # so unchanged positions can skip the pulse-width rewrite.
+            if self.left_servo is not None and abs(left - self._current_left) > SERVO_DEADBAND:
+                self.left_servo.value = left
+            if self.right_servo is not None and abs(right - self._current_right) > SERVO_DEADBAND:
+                self.right_servo.value = right
+        self._current_left = left
+        self._current_right = right
 
     def close(self) -> None:
-        self.perform('rest')
+        concurrent.futures.wait([self.perform('rest')])
+        self._executor.shutdown(wait=True)
         if self.left_servo:
             self.left_servo.close()
         if self.right_servo:
@@ -10,6 +10,8 @@ try:  # pragma: no cover - optional dependency only available on Pi
 except Exception:  # pragma: no cover
     Servo = None  # type: ignore
 
+from src.utils.servo import SERVO_DEADBAND, make_servo
+
 LOGGER = logging.getLogger(__name__)
 
 # Servo value range is -1 (fully backward) to 1 (fully forward).
@@ -19,7 +21,10 @@ DEFAULT_CLOSE_VALUE = 0.8
 
 
 class GripperController:
-    """Drives a single servo-based gripper with open/close helpers."""
+    """Drives a single servo-based gripper with open/close helpers.
+
+    Writes pulse widths straight to ``pigpiod`` when it is running (``sudo pigpiod``).
+    """
 
     def __init__(
         self,
@@ -34,9 +39,10 @@ class GripperController:
         self.close_value = max(-1.0, min(1.0, close_value))
         self._last_value = self.open_value
         self._servo = None
+        self._servo_value: Optional[float] = None
         if not self.simulate and Servo is not None:
             try:  # pragma: no cover - hardware specific
-                self._servo = Servo(pin)
+                self._servo = make_servo(pin)
             except Exception as exc:  # pragma: no cover
                 LOGGER.warning("Failed to initialise gripper servo, falling back to simulation: %s", exc)
                 self.simulate = True
@@ -62,8 +68,11 @@ class GripperController:
         if self.simulate:
             LOGGER.debug("[SIM] Gripper value=%s", clamped)
             return
-        if self._servo is not None:
+        if self._servo is not None and (
+            self._servo_value is None or abs(clamped - self._servo_value) > SERVO_DEADBAND
+        ):
             self._servo.value = clamped
+            self._servo_value = clamped
 
     def close_controller(self) -> None:
         self.open()
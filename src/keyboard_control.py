@@ -16,46 +16,80 @@ if __package__ is None or __package__ == "":
 from src.movement import Movement
 
 
+RENDER_INTERVAL_S = 1.0 / 60.0
+POLL_TIMEOUT_MS = 100
+
+
+KEY_ACTIONS = {
+    ord('w'): 'move_forward', curses.KEY_UP: 'move_forward',
+    ord('s'): 'move_backward', curses.KEY_DOWN: 'move_backward',
+    ord('a'): 'turn_left', curses.KEY_LEFT: 'turn_left',
+    ord('d'): 'turn_right', curses.KEY_RIGHT: 'turn_right',
+    ord(' '): 'stop',
+}
+
+
+def apply_action(m, action, speed):
+    if action == 'stop':
+        m.stop()
+    else:
+        getattr(m, action)(speed)
+
+
+def render(stdscr, m, mode):
+    # erase() only blanks the buffer; clear() would force a full terminal repaint.
+    stdscr.erase()
+    status = f"pos={m.position} dir={m.direction}" if not getattr(m, '_hw', False) else "HARDWARE mode"
+    stdscr.addstr(0, 0, f"Keyboard teleop ({mode}) — {status}")
+    stdscr.addstr(2, 0, "Controls: W/A/S/D or arrows, space=stop, q=quit")
+    stdscr.refresh()
+
+
 def main(stdscr, speed, simulate=False):
     # Curses setup
     curses.curs_set(0)
     stdscr.nodelay(True)
-    stdscr.timeout(100)
+    stdscr.timeout(POLL_TIMEOUT_MS)
 
     m = Movement(simulate=simulate)
 
     # show initial mode
     mode = "HARDWARE" if getattr(m, '_hw', False) else "SIMULATION"
-    stdscr.clear()
+    stdscr.erase()
     stdscr.addstr(0, 0, f"Keyboard teleop ({mode}) — W/A/S/D or arrows to drive — space to stop — q to quit")
     stdscr.refresh()
 
+    last_render = 0.0
+    dirty = False
     try:
         while True:
+            # Blocks for up to POLL_TIMEOUT_MS, so an idle loop sleeps in curses.
             c = stdscr.getch()
-            if c == -1:
-                time.sleep(0.01)
-                continue
-            # WASD or arrow keys
-            if c in (ord('w'), curses.KEY_UP):
-                m.move_forward(speed)
-            elif c in (ord('s'), curses.KEY_DOWN):
-                m.move_backward(speed)
-            elif c in (ord('a'), curses.KEY_LEFT):
-                m.turn_left(speed)
-            elif c in (ord('d'), curses.KEY_RIGHT):
-                m.turn_right(speed)
-            elif c == ord(' '):
-                m.stop()
-            elif c == ord('q'):
-                m.stop()
-                break
-            # update status (position/direction in simulation)
-            stdscr.clear()
-            status = f"pos={m.position} dir={m.direction}" if not getattr(m, '_hw', False) else "HARDWARE mode"
-            stdscr.addstr(0, 0, f"Keyboard teleop ({mode}) — {status}")
-            stdscr.addstr(2, 0, "Controls: W/A/S/D or arrows, space=stop, q=quit")
-            stdscr.refresh()
+            if c != -1:
+                # Drain every key already queued (held keys, pastes); only the last
+                # drive command matters, so the motors get one call per batch.
+                action = None
+                stdscr.timeout(0)
+                while c != -1:
+                    if c == ord('q'):
+                        m.stop()
+                        curses.flushinp()
+                        return
+                    action = KEY_ACTIONS.get(c, action)
+                    c = stdscr.getch()
+                stdscr.timeout(POLL_TIMEOUT_MS)
+                if action is not None:
+                    apply_action(m, action, speed)
+                    if action == 'stop':
+                        # Drop auto-repeat still buffered from a held key so it cannot restart the motors.
+                        curses.flushinp()
+                    dirty = True
+            # update status (position/direction in simulation), at most 60 times a second
+            now = time.monotonic()
+            if dirty and now - last_render >= RENDER_INTERVAL_S:
+                render(stdscr, m, mode)
+                last_render = now
+                dirty = False
     finally:
         m.stop()
 
@@ -8,10 +8,11 @@ Usage:
 """
 
 import argparse
+import contextlib
+import os
 import select
 import sys
 import termios
-import time
 import tty
 from pathlib import Path
 
@@ -23,58 +24,93 @@ from src.movement import Movement
 
 ARROW_PREFIX = '\x1b['
 
+KEY_ACTIONS = {
+    'w': 'move_forward', 'W': 'move_forward', '\x1b[A': 'move_forward',
+    's': 'move_backward', 'S': 'move_backward', '\x1b[B': 'move_backward',
+    'a': 'turn_left', 'A': 'turn_left', '\x1b[D': 'turn_left',
+    'd': 'turn_right', 'D': 'turn_right', '\x1b[C': 'turn_right',
+    ' ': 'stop',
+}
 
-def read_key(timeout=0.1):
-    """Read a single key (non-blocking up to timeout seconds).
-    Returns the string read (possibly multi-byte for arrows), or None if nothing.
+
+@contextlib.contextmanager
+def cbreak_terminal(fd):
+    """Put the terminal in cbreak mode once for the whole session.
+
+    cbreak (not raw) keeps output processing and Ctrl-C, so status prints and
+    KeyboardInterrupt behave normally while keys arrive unbuffered and unechoed.
     """
-    fd = sys.stdin.fileno()
     old = termios.tcgetattr(fd)
     try:
-        tty.setraw(fd)
-        rlist, _, _ = select.select([fd], [], [], timeout)
-        if not rlist:
-            return None
-        ch = sys.stdin.read(1)
-        if ch == '\x1b':
-            # possibly an arrow key sequence
-            rest = sys.stdin.read(2)
-            return ch + rest
-        return ch
+        tty.setcbreak(fd)
+        yield
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old)
 
 
+def split_keys(data):
+    """Split raw terminal input into keys, keeping arrow escape sequences whole."""
+    keys = []
+    i = 0
+    while i < len(data):
+        if data.startswith(ARROW_PREFIX, i) and i + 2 < len(data):
+            keys.append(data[i:i + 3])
+            i += 3
+        else:
+            keys.append(data[i])
+            i += 1
+    return keys
+
+
+def discard_pending_input(fd):
+    """Drop buffered keystrokes (e.g. auto-repeat from a key that was just released)."""
+    termios.tcflush(fd, termios.TCIFLUSH)
+
+
+def read_keys(timeout=0.1):
+    """Wait up to ``timeout`` seconds for input and return every key that arrived.
+
+    Expects the terminal to be in cbreak mode (see :func:`cbreak_terminal`); a
+    single read picks up multi-byte arrow sequences and anything queued behind them.
+    """
+    fd = sys.stdin.fileno()
+    rlist, _, _ = select.select([fd], [], [], timeout)
+    if not rlist:
+        return []
+    return split_keys(os.read(fd, 64).decode('utf-8', 'ignore'))
+
+
 def main(speed=0.8, simulate=False):
     m = Movement(simulate=simulate)
     print(f"Starting simple teleop (mode: {'HARDWARE' if getattr(m, '_hw', False) else 'SIMULATION'})")
     print("Controls: W/A/S/D or arrows, space=stop, q=quit")
 
     try:
-        while True:
-            key = read_key(timeout=0.2)
-            if key is None:
-                # idle
-                time.sleep(0.01)
-                continue
-            # normalize
-            if key in ('w', 'W', '\x1b[A'):
-                m.move_forward(speed)
-            elif key in ('s', 'S', '\x1b[B'):
-                m.move_backward(speed)
-            elif key in ('a', 'A', '\x1b[D'):
-                m.turn_left(speed)
-            elif key in ('d', 'D', '\x1b[C'):
-                m.turn_right(speed)
-            elif key == ' ':
-                m.stop()
-            elif key in ('q', 'Q'):
-                m.stop()
-                print('Quitting teleop')
-                break
-            # echo status in simulation mode
-            if not getattr(m, '_hw', False):
-                print(f"pos={m.position} dir={m.direction}")
+        with cbreak_terminal(sys.stdin.fileno()):
+            while True:
+                # read_keys blocks in select() for the whole timeout when idle.
+                keys = read_keys(timeout=0.2)
+                if not keys:
+                    continue
+                if 'q' in keys or 'Q' in keys:
+                    m.stop()
+                    discard_pending_input(sys.stdin.fileno())
+                    print('Quitting teleop')
+                    break
+                # Only the last drive command of a burst (held key, paste) is sent to the motors.
+                action = None
+                for key in keys:
+                    action = KEY_ACTIONS.get(key, action)
+                if action is None:
+                    continue
+                if action == 'stop':
+                    m.stop()
+                    discard_pending_input(sys.stdin.fileno())
+                else:
+                    getattr(m, action)(speed)
+                # echo status in simulation mode
+                if not getattr(m, '_hw', False):
+                    print(f"pos={m.position} dir={m.direction}")
     except KeyboardInterrupt:
         m.stop()
 
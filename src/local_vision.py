@@ -9,13 +9,20 @@ master loop can narrate results exactly like the cloud integrations.
 
 from __future__ import annotations
 
+import atexit
+import concurrent.futures
 import logging
-from typing import Iterable, List, Optional
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 try:  # pragma: no cover - optional runtime dependency
     import cv2
+    import numpy as np
 except Exception:  # pragma: no cover
     cv2 = None  # type: ignore
+    np = None  # type: ignore
 
 try:  # pragma: no cover - optional runtime dependency
     from ultralytics import YOLO
@@ -24,6 +31,181 @@ except Exception:  # pragma: no cover
 
 LOGGER = logging.getLogger(__name__)
 
+# detect() fails if the grabber has not produced a frame this recent.
+FRAME_MAX_AGE_S = 1.0
+# Frames whose 32x32 thumbnails differ by less than this mean absolute pixel
+# error reuse the previous detections, for at most STATIC_REUSE_S seconds.
+STATIC_DIGEST_SIZE = (32, 32)
+STATIC_MAE_THRESHOLD = 2.0
+STATIC_REUSE_S = 1.0
+# Inference runs on a background thread while detect() keeps being called, and
+# stops once this many inference periods pass without a call, so a one-off
+# detect() costs roughly one extra inference rather than seconds of CPU.
+BACKGROUND_IDLE_PERIODS = 1.5
+# Assumed inference period until the first real inference has been timed.
+DEFAULT_INFER_PERIOD_S = 0.2
+# Longest detect() waits for the first result after the thread (re)starts.
+FIRST_RESULT_TIMEOUT_S = 10.0
+# Pause between checks when no new frame has arrived or the camera failed.
+FRAME_POLL_S = 0.02
+# Inference resolution; 320 keeps a Pi near interactive rates with yolov8n.
+DEFAULT_IMGSZ = 320
+# Where Ultralytics writes each export format relative to the source ``.pt``.
+_EXPORT_SUFFIXES = {'onnx': '.onnx', 'ncnn': '_ncnn_model'}
+# Ask the camera for small MJPG frames so USB bandwidth and decode are not
+# spent on pixels YOLO immediately scales away.
+DEFAULT_FRAME_SIZE: Tuple[int, int] = (640, 480)
+DEFAULT_CAPTURE_FPS = 15
+
+
+def _load_model(model_path: str, export_format: Optional[str], imgsz: int):
+    """Load ``model_path``, exporting a ``.pt`` to ``export_format`` on first use.
+
+    The PyTorch runtime is slow on a Pi; ONNX Runtime and NCNN run the same
+    weights on NEON kernels. Exports have a fixed input shape, so each is
+    stored next to the ``.pt`` under a name carrying ``imgsz`` (e.g.
+    ``yolov8n_320.onnx``) and reused only by runs at that size.
+    """
+    if export_format is None or not model_path.endswith('.pt'):
+        return YOLO(model_path)
+    suffix = _EXPORT_SUFFIXES.get(export_format)
+    if suffix is None:
+        raise ValueError(f'Unsupported YOLO export format: {export_format}')
+    exported = Path(f"{model_path[: -len('.pt')]}_{imgsz}{suffix}")
+    if not exported.exists():
+        LOGGER.info('Exporting %s to %s at imgsz=%d (one-time)', model_path, export_format, imgsz)
+        # Ultralytics always writes <stem><suffix>; move it aside so other sizes get their own.
+        Path(YOLO(model_path).export(format=export_format, imgsz=imgsz)).replace(exported)
+    return YOLO(str(exported), task='detect')
+
+
+class _CameraFeed:
+    """One opened camera and its grabber thread, shared by every client on that index.
+
+    The grabber keeps only the newest frame, so detect() never waits on the
+    camera and never runs on a frame that sat in the driver's queue.
+    """
+
+    def __init__(self, camera_index: int, frame_size: Tuple[int, int], fps: int) -> None:
+        self.cap = cv2.VideoCapture(camera_index)
+        if not self.cap or not self.cap.isOpened():
+            raise RuntimeError(f'Failed to open camera index {camera_index}')
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, frame_size[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, frame_size[1])
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # Keep the driver queue to one frame; the grabber already drops stale ones.
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.frame_size = tuple(frame_size)
+        self.fps = fps
+        self.users = 0
+        self._lock = threading.Lock()
+        self._latest = None
+        self._latest_ts = 0.0
+        self._frame_ready = threading.Event()
+        self._running = True
+        self._grabber = threading.Thread(target=self._grab_loop, daemon=True)
+        self._grabber.start()
+
+    def latest_frame(self):
+        if not self._frame_ready.wait(timeout=FRAME_MAX_AGE_S):
+            raise RuntimeError('Failed to capture frame from camera')
+        with self._lock:
+            frame, stamp = self._latest, self._latest_ts
+        if time.monotonic() - stamp > FRAME_MAX_AGE_S:
+            raise RuntimeError('Failed to capture frame from camera')
+        return frame
+
+    def release(self) -> None:
+        self._running = False
+        self._grabber.join(timeout=1.0)
+        self.cap.release()
+
+    def _grab_loop(self) -> None:  # pragma: no cover - requires a camera
+        while self._running:
+            ok, frame = self.cap.read()
+            if not ok:
+                time.sleep(0.05)
+                continue
+            # read() returns a fresh array, so handing the reference to detect() is safe.
+            with self._lock:
+                self._latest = frame
+                self._latest_ts = time.monotonic()
+            self._frame_ready.set()
+
+
+# Cameras and models are expensive to open and load, and a camera can only be
+# opened once, so clients share them. Models carry a lock because a YOLO
+# predictor is not safe to call from two threads at once. Each model entry is a
+# Future so a slow load or export runs outside _SHARED_LOCK while later clients
+# for the same key wait on it.
+_SHARED_LOCK = threading.Lock()
+_FEEDS: Dict[int, _CameraFeed] = {}
+_MODELS: Dict[Tuple[str, Optional[str], int], 'concurrent.futures.Future[Tuple[object, threading.Lock]]'] = {}
+
+
+def _acquire_feed(camera_index: int, frame_size: Tuple[int, int], fps: int) -> _CameraFeed:
+    with _SHARED_LOCK:
+        feed = _FEEDS.get(camera_index)
+        if feed is None:
+            feed = _FEEDS[camera_index] = _CameraFeed(camera_index, frame_size, fps)
+        elif (feed.frame_size, feed.fps) != (tuple(frame_size), fps):
+            LOGGER.warning(
+                'Camera %d already open at %sx%s@%s; ignoring requested %sx%s@%s',
+                camera_index, *feed.frame_size, feed.fps, *frame_size, fps,
+            )
+        feed.users += 1
+        return feed
+
+
+def _release_feed(camera_index: int) -> None:
+    with _SHARED_LOCK:
+        feed = _FEEDS.get(camera_index)
+        if feed is None:
+            return
+        feed.users -= 1
+        if feed.users > 0:
+            return
+        del _FEEDS[camera_index]
+    feed.release()
+
+
+def _shared_model(model_path: str, export_format: Optional[str], imgsz: int) -> Tuple[object, threading.Lock, bool]:
+    """Return ``(model, lock, loaded_now)`` for the cached model with these settings."""
+    key = (model_path, export_format, imgsz)
+    with _SHARED_LOCK:
+        pending = _MODELS.get(key)
+        loaded_now = pending is None
+        if loaded_now:
+            pending = _MODELS[key] = concurrent.futures.Future()
+    if not loaded_now:
+        model, lock = pending.result()
+        return model, lock, False
+    try:
+        model = _load_model(model_path, export_format, imgsz)
+    except BaseException as exc:
+        with _SHARED_LOCK:
+            if _MODELS.get(key) is pending:
+                del _MODELS[key]
+        pending.set_exception(exc)
+        raise
+    lock = threading.Lock()
+    pending.set_result((model, lock))
+    return model, lock, True
+
+
+def shutdown() -> None:
+    """Release every shared camera and drop cached models (registered with ``atexit``)."""
+    with _SHARED_LOCK:
+        feeds = list(_FEEDS.values())
+        _FEEDS.clear()
+        _MODELS.clear()
+    for feed in feeds:
+        feed.release()
+
+
+atexit.register(shutdown)
+
 
 class LocalYoloClient:
     """Capture frames locally and run them through a YOLO model."""
@@ -35,60 +217,178 @@ class LocalYoloClient:
         camera_index: int = 0,
         classes: Optional[Iterable[int]] = None,
         conf: float = 0.25,
+        imgsz: int = DEFAULT_IMGSZ,
+        export_format: Optional[str] = None,
+        frame_size: Tuple[int, int] = DEFAULT_FRAME_SIZE,
+        fps: int = DEFAULT_CAPTURE_FPS,
     ) -> None:
         if YOLO is None or cv2 is None:
             raise RuntimeError(
                 'LocalYoloClient requires opencv-python and ultralytics installed. '
                 'Install with `pip install opencv-python ultralytics`.'
             )
-        self.model = YOLO(model_path)
-        self.cap = cv2.VideoCapture(camera_index)
-        if not self.cap or not self.cap.isOpened():
-            raise RuntimeError(f'Failed to open camera index {camera_index}')
+        self.imgsz = imgsz
+        self.model, self._model_lock, loaded_now = _shared_model(model_path, export_format, imgsz)
+        self.camera_index = camera_index
+        self._feed: Optional[_CameraFeed] = _acquire_feed(camera_index, frame_size, fps)
+        self.cap = self._feed.cap
         self.classes = tuple(classes) if classes is not None else None
         self.conf = conf
+        self._last_digest = None
+        self._last_infer_ts = 0.0
+        self._last_detections: List[dict] = []
+        self._label_names = None
+        self._labels: List[str] = []
+        self._state_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._results_ready = threading.Event()
+        self._infer_thread: Optional[threading.Thread] = None
+        self._last_request_ts = 0.0
+        self._infer_period_s = DEFAULT_INFER_PERIOD_S
+        self._latest_detections: List[dict] = []
+        self._latest_error: Optional[Exception] = None
+        if loaded_now:
+            self._warm_up(frame_size)
 
     def detect(self) -> List[dict]:
-        ok, frame = self.cap.read()
-        if not ok:
-            raise RuntimeError('Failed to capture frame from camera')
-        height, width = frame.shape[:2]
-        results = self.model(frame, stream=True, verbose=False, conf=self.conf, classes=self.classes)
-        detections: List[dict] = []
-        for result in results:
-            names = result.names
-            for box in getattr(result, 'boxes', []):
-                cls_index = int(box.cls[0]) if box.cls is not None else None
-                if cls_index is None:
-                    continue
-                label = names.get(cls_index, str(cls_index)).lower().replace(' ', '_')
-                conf = float(box.conf[0]) if box.conf is not None else 0.0
-                if conf <= 0:
+        """Return the newest detections from the background inference thread.
+
+        The first call after an idle period starts the thread and waits for its
+        first result; later calls return immediately with whatever finished last.
+        """
+        if self._feed is None:
+            raise RuntimeError('LocalYoloClient is closed')
+        with self._state_lock:
+            self._last_request_ts = time.monotonic()
+            if self._infer_thread is None:
+                self._results_ready.clear()
+                self._infer_thread = threading.Thread(target=self._infer_loop, daemon=True)
+                self._infer_thread.start()
+        if not self._results_ready.wait(timeout=FIRST_RESULT_TIMEOUT_S):
+            raise RuntimeError('YOLO inference timed out')
+        with self._state_lock:
+            if self._latest_error is not None:
+                raise self._latest_error
+            return list(self._latest_detections)
+
+    def _infer_loop(self) -> None:
+        feed = self._feed
+        last_frame = None
+        while not self._stop.is_set():
+            with self._state_lock:
+                idle_s = BACKGROUND_IDLE_PERIODS * self._infer_period_s
+                if time.monotonic() - self._last_request_ts > idle_s:
+                    self._infer_thread = None
+                    return
+            try:
+                frame = feed.latest_frame()
+                if frame is last_frame:
+                    self._stop.wait(FRAME_POLL_S)
                     continue
-                xyxy = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = xyxy
-                center_x = ((x1 + x2) / 2.0) / max(width, 1)
-                center_y = ((y1 + y2) / 2.0) / max(height, 1)
-                area = max((x2 - x1) * (y2 - y1), 1.0)
-                norm_area = area / float(width * height)
-                detections.append(
-                    {
-                        'label': label,
-                        'distance_cm': self._estimate_distance(norm_area),
-                        'angle_deg': (center_x - 0.5) * 90.0,
-                        'confidence': conf,
-                        'center': {'x': float(center_x), 'y': float(center_y)},
-                    }
-                )
-        return detections
+                last_frame = frame
+                detections, error = self._detect_frame(frame), None
+            except Exception as exc:
+                LOGGER.debug('YOLO background detection failed: %s', exc)
+                detections, error = [], exc
+                self._stop.wait(FRAME_POLL_S)
+            with self._state_lock:
+                self._latest_detections = detections
+                self._latest_error = error
+            self._results_ready.set()
+
+    def _detect_frame(self, frame) -> List[dict]:
+        # Only the inference thread calls this, so the _last_* cache needs no lock.
+        digest = cv2.resize(frame, STATIC_DIGEST_SIZE, interpolation=cv2.INTER_AREA)
+        now = time.monotonic()
+        if (
+            self._last_digest is not None
+            and now - self._last_infer_ts < STATIC_REUSE_S
+            and float(cv2.absdiff(digest, self._last_digest).mean()) < STATIC_MAE_THRESHOLD
+        ):
+            return list(self._last_detections)
+        detections = self._infer(frame)
+        self._infer_period_s = time.monotonic() - now
+        self._last_digest = digest
+        self._last_infer_ts = now
+        self._last_detections = detections
+        return list(detections)
+
+    def detect_batch(self, frames: Sequence) -> List[List[dict]]:
+        """Run several frames (e.g. saved snapshots) through the model in one forward pass."""
+        if not frames:
+            return []
+        with self._model_lock:
+            results = self.model(
+                list(frames), stream=False, verbose=False, conf=self.conf, classes=self.classes, imgsz=self.imgsz
+            )
+        return [self._result_detections(result, frame) for result, frame in zip(results, frames)]
+
+    def _infer(self, frame) -> List[dict]:
+        return self.detect_batch([frame])[0]
+
+    def _result_detections(self, result, frame) -> List[dict]:
+        boxes = getattr(result, 'boxes', None)
+        if boxes is None or len(boxes) == 0:
+            return []
+        height, width = frame.shape[:2]
+        inv_w = 1.0 / max(width, 1)
+        inv_h = 1.0 / max(height, 1)
+        # One device-to-host copy per tensor instead of one per box.
+        xyxy = boxes.xyxy.cpu().numpy()
+        confs = boxes.conf.cpu().numpy()
+        classes = boxes.cls.cpu().numpy().astype(int)
+        keep = confs > 0
+        xyxy, confs, classes = xyxy[keep], confs[keep], classes[keep]
+        centers_x = (xyxy[:, 0] + xyxy[:, 2]) * (0.5 * inv_w)
+        centers_y = (xyxy[:, 1] + xyxy[:, 3]) * (0.5 * inv_h)
+        areas = np.clip((xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1]), 1.0, None)
+        distances = np.clip(180.0 / np.sqrt(areas * (inv_w * inv_h)), 6.0, 120.0)
+        angles = (centers_x - 0.5) * 90.0
+        labels = self._label_table(result.names)
+        size = len(labels)
+        return [
+            {
+                # A class id outside the model's names falls back to the bare id.
+                'label': labels[cls_index] if 0 <= cls_index < size else str(cls_index),
+                'distance_cm': distance,
+                'angle_deg': angle,
+                'confidence': conf,
+                'center': {'x': center_x, 'y': center_y},
+            }
+            for cls_index, conf, distance, angle, center_x, center_y in zip(
+                classes.tolist(),
+                confs.tolist(),
+                distances.tolist(),
+                angles.tolist(),
+                centers_x.tolist(),
+                centers_y.tolist(),
+            )
+        ]
+
+    def _warm_up(self, frame_size: Tuple[int, int]) -> None:
+        """Run one blank frame so kernel setup is not charged to the first real detect()."""
+        blank = np.zeros((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+        try:
+            self._infer(blank)
+        except Exception as exc:  # pragma: no cover - backend specific
+            LOGGER.warning('YOLO warm-up failed (%s); first detection may be slow', exc)
+
+    def _label_table(self, names: dict) -> List[str]:
+        """Normalised labels indexed by class id, rebuilt only if the model's names change."""
+        if names is not self._label_names:
+            size = max(names, default=-1) + 1
+            self._labels = [names.get(i, str(i)).lower().replace(' ', '_') for i in range(size)]
+            self._label_names = names
+        return self._labels
 
     def close(self) -> None:
-        if self.cap:
-            self.cap.release()
-
-    @staticmethod
-    def _estimate_distance(normalized_area: float) -> float:
-        if normalized_area <= 0:
-            return 80.0
-        distance = 180.0 * (normalized_area ** -0.5)
-        return max(6.0, min(distance, 120.0))
+        # The camera is released once its last client closes; models stay cached until shutdown().
+        if self._feed is None:
+            return
+        self._stop.set()
+        with self._state_lock:
+            thread = self._infer_thread
+        if thread is not None:
+            thread.join(timeout=FIRST_RESULT_TIMEOUT_S)
+        self._feed = None
+        _release_feed(self.camera_index)
@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import argparse
+import array
+import concurrent.futures
+import functools
 import logging
 import os
+import queue
+import re
 import sys
 import threading
-import time
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Sequence, Tuple
 
@@ -21,9 +25,6 @@ from src.gesture_control import GestureController
 from src.gripper_control import GripperController
 from src.movement import Movement
 from src.object_perception import ObjectRecognizer
-from src.remote_vision import RemoteVisionClient
-from src.cloud_vision import GoogleVisionClient, DEFAULT_ENDPOINT as GOOGLE_DEFAULT_ENDPOINT
-from src.local_vision import LocalYoloClient
 from src.personality_adapter import PersonalityAdapter, DEFAULT_PERSONA, load_persona_from_file
 from src.safe_shutdown import SafeShutdown
 from src.sensors import DistanceSensorWrapper
@@ -33,6 +34,29 @@ from src.wall_guard import WallGuard
 
 LOGGER = logging.getLogger(__name__)
 
+# How often the wall guard samples the ultrasonic sensor while driving forward.
+GUARD_POLL_S = 0.03
+# Motion state codes shared between the dispatcher and the wall guard.
+MOTION_CODES = {'stop': 0, 'forward': 1, 'backward': 2, 'left': 3, 'right': 4}
+MOTION_FORWARD = MOTION_CODES['forward']
+# Tuning actions ("speed_set:0.600", "trim_adj:left:+0.050", "trim_reset") parsed in one match;
+# _TUNING_ARGS says whether each op takes a side and an amount.
+_TUNING_RE = re.compile(
+    r'(?P<op>speed_set|speed_adj|trim_set|trim_adj|trim_reset)'
+    r'(?::(?P<side>left|right))?(?::(?P<amount>[-+]?(?:\d+(?:\.\d*)?|\.\d+)))?$'
+)
+_TUNING_ARGS = {
+    'speed_set': (False, True),
+    'speed_adj': (False, True),
+    'trim_set': (True, True),
+    'trim_adj': (True, True),
+    'trim_reset': (False, False),
+}
+# How often the master loop checks for a new utterance; bounds Ctrl-C latency.
+LISTEN_POLL_S = 0.1
+# Action types that still run when the chatbot sends no value ("describe everything").
+VALUELESS_ACTIONS = frozenset({'vision'})
+
 
 def parse_pins(pins: Sequence[int], expected: int, description: str) -> Tuple[int, ...]:
     if len(pins) != expected:
@@ -40,6 +64,33 @@ def parse_pins(pins: Sequence[int], expected: int, description: str) -> Tuple[in
     return tuple(int(p) for p in pins)
 
 
+def parse_tuning(value: str) -> Optional[Tuple[str, Optional[str], float]]:
+    """Split a tuning action into ``(op, side, amount)``; None if it is malformed."""
+    match = _TUNING_RE.match(value)
+    if match is None:
+        return None
+    op, side, amount = match.group('op', 'side', 'amount')
+    if (side is not None, amount is not None) != _TUNING_ARGS[op]:
+        return None
+    return op, side, float(amount) if amount is not None else 0.0
+
+
+def _ignore_action() -> None:
+    """Fallback for unknown autonomy/gripper values."""
+
+
+@functools.lru_cache(maxsize=8)
+def _load_persona_cached(path: str, mtime: float) -> Tuple[Dict[str, str], str]:
+    """Parse a persona file and render its prompt text; ``mtime`` invalidates on edits."""
+    persona = load_persona_from_file(path)
+    return persona, "\n".join(f"{k}={v}" for k, v in persona.items())
+
+
+def _log_worker_failure(future: concurrent.futures.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        LOGGER.error("Background worker failed", exc_info=future.exception())
+
+
 def run_master(
     *,
     simulate: bool,
@@ -67,6 +118,8 @@ def run_master(
     yolo_model: Optional[str],
     yolo_conf: Optional[float],
     yolo_classes: Optional[Sequence[int]],
+    yolo_imgsz: int,
+    yolo_export: Optional[str],
     color_config_path: Optional[str],
 ) -> None:
     logging.basicConfig(level=logging.INFO)
@@ -75,12 +128,13 @@ def run_master(
     persona_text: Optional[str] = None
     if persona_path:
         try:
-            persona = load_persona_from_file(persona_path)
-            persona_text = "\n".join(f"{k}={v}" for k, v in persona.items())
+            cached, persona_text = _load_persona_cached(persona_path, os.stat(persona_path).st_mtime)
+            persona = dict(cached)
         except Exception as exc:
             LOGGER.warning("Failed to load persona %s: %s", persona_path, exc)
 
     adapter = PersonalityAdapter(persona)
+    wall_phrase = adapter.apply("Wall ahead, stopping.")
     movement = Movement(left_pins=left_pins, right_pins=right_pins, simulate=simulate)
     voice = Voice(simulate=simulate)
     chatbot = Chatbot(attitude=persona.get('tone', 'friendly'), simulate=True, control_mode=True)
@@ -91,9 +145,13 @@ def run_master(
     )
     gripper = GripperController(pin=gripper_pin, simulate=simulate)
 
-    remote_client: Optional[RemoteVisionClient] = None
+    # The vision clients pull in requests/OpenCV/ultralytics, so they are only
+    # imported when configured; simulation and keyless runs never load them.
+    remote_client = None
     if vision_endpoint and vision_key and not simulate:
         try:
+            from src.remote_vision import RemoteVisionClient
+
             remote_client = RemoteVisionClient(api_url=vision_endpoint, api_key=vision_key, camera_index=camera_index)
         except Exception as exc:
             LOGGER.warning("Remote vision unavailable (%s); falling back to local/simulated perception", exc)
@@ -102,6 +160,8 @@ def run_master(
     google_client = None
     if google_vision_key and not simulate:
         try:
+            from src.cloud_vision import GoogleVisionClient, DEFAULT_ENDPOINT as GOOGLE_DEFAULT_ENDPOINT
+
             google_client = GoogleVisionClient(
                 api_key=google_vision_key,
                 camera_index=camera_index,
@@ -115,11 +175,15 @@ def run_master(
     yolo_client = None
     if yolo_model and not simulate:
         try:
+            from src.local_vision import LocalYoloClient
+
             yolo_client = LocalYoloClient(
                 model_path=yolo_model,
                 camera_index=camera_index,
                 conf=yolo_conf if yolo_conf is not None else 0.25,
                 classes=[int(cls) for cls in yolo_classes] if yolo_classes else None,
+                imgsz=yolo_imgsz,
+                export_format=yolo_export,
             )
         except Exception as exc:
             LOGGER.warning("Local YOLO unavailable (%s); continuing without it", exc)
@@ -136,7 +200,7 @@ def run_master(
         simulate=simulate,
         camera_index=camera_index,
         color_map=color_override,
-        remote_client=yolo_client or google_client or remote_client,
+        remote_clients=[client for client in (yolo_client, google_client, remote_client) if client is not None],
     )
 
     front_sensor: Optional[DistanceSensorWrapper] = None
@@ -146,6 +210,9 @@ def run_master(
             echo=sensor_echo,
             trigger=sensor_trigger,
             simulate=simulate,
+            # The guard and autonomy share this sensor; a reading taken within
+            # one guard poll is reused rather than pinging again.
+            max_age_s=GUARD_POLL_S,
         )
         wall_guard = WallGuard(front_sensor)
 
@@ -163,7 +230,29 @@ def run_master(
     monitor = BatteryMonitor(reader, config=BatteryConfig())
     shutdown = SafeShutdown(monitor, movement=movement, simulate=simulate)
 
-    auto_state: Dict[str, Optional[object]] = {'driver': None, 'thread': None, 'sensor': None, 'owns_sensor': None}
+    # Autonomy runs on a small pool so toggling it reuses a worker thread instead
+    # of spawning a new one each time. The second slot lets a restarted run begin
+    # while a previous one is still winding down.
+    workers = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='robot')
+
+    def run_in_background(fn) -> concurrent.futures.Future:
+        future = workers.submit(fn)
+        future.add_done_callback(_log_worker_failure)
+        return future
+
+    def start_daemon(fn, name: str) -> threading.Thread:
+        """Run a loop that lives as long as the robot on its own daemon thread."""
+        def target() -> None:
+            try:
+                fn()
+            except Exception:
+                LOGGER.exception("Background worker %s failed", name)
+
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    auto_state: Dict[str, Optional[object]] = {'driver': None, 'future': None, 'sensor': None, 'owns_sensor': None}
 
     def start_autonomy() -> None:
         if auto_state['driver'] is not None:
@@ -182,27 +271,36 @@ def run_master(
             auto_state['sensor'] = sensor
             auto_state['owns_sensor'] = True
         auto_state['driver'] = driver
-        thread = threading.Thread(target=driver.run, daemon=True)
-        auto_state['thread'] = thread
-        thread.start()
+        auto_state['future'] = run_in_background(driver.run)
 
     def stop_autonomy() -> None:
         driver = auto_state['driver']
-        thread = auto_state['thread']
+        future = auto_state['future']
         sensor = auto_state['sensor']
         if driver is None:
             return
         driver.stop()
-        if thread:
-            thread.join(timeout=1.0)
+        if future:
+            concurrent.futures.wait([future], timeout=1.0)
         if auto_state.get('owns_sensor') and sensor:
             sensor.close()
         auto_state['driver'] = None
-        auto_state['thread'] = None
+        auto_state['future'] = None
         auto_state['sensor'] = None
         auto_state['owns_sensor'] = None
 
-    current_motion = {'value': 'stop'}
+    # One-slot code array: the guard's check is an index load rather than a dict lookup.
+    current_motion = array.array('b', [MOTION_CODES['stop']])
+    # Signalled on every motion change so the wall guard only polls while driving forward.
+    motion_cv = threading.Condition()
+
+    def set_motion(action: str) -> None:
+        code = MOTION_CODES.get(action)
+        if code is None:
+            return
+        with motion_cv:
+            current_motion[0] = code
+            motion_cv.notify_all()
 
     def apply_movement(action: str) -> None:
         if action == 'forward':
@@ -215,148 +313,155 @@ def run_master(
             movement.turn_right()
         elif action == 'stop':
             movement.stop()
-        current_motion['value'] = action
+        set_motion(action)
+
+    def set_trim_side(side: str, value: float) -> None:
+        if side == 'left':
+            movement.set_left_trim(value)
+        elif side == 'right':
+            movement.set_right_trim(value)
+
+    def adjust_trim_side(side: str, value: float) -> None:
+        if side == 'left':
+            movement.adjust_trim(left_delta=value)
+        elif side == 'right':
+            movement.adjust_trim(right_delta=value)
+
+    tuning_handlers = {
+        'speed_set': lambda side, value: movement.set_speed_scale(value),
+        'speed_adj': lambda side, value: movement.adjust_speed_scale(value),
+        'trim_reset': lambda side, value: movement.reset_trim(),
+        'trim_set': set_trim_side,
+        'trim_adj': adjust_trim_side,
+    }
 
     def apply_tuning(action_value: str) -> None:
-        if action_value.startswith('speed_set:'):
-            try:
-                movement.set_speed_scale(float(action_value.split(':', 1)[1]))
-            except ValueError:
-                LOGGER.debug('Invalid speed_set value: %s', action_value)
-        elif action_value.startswith('speed_adj:'):
-            try:
-                movement.adjust_speed_scale(float(action_value.split(':', 1)[1]))
-            except ValueError:
-                LOGGER.debug('Invalid speed_adj value: %s', action_value)
-        elif action_value == 'trim_reset':
-            movement.reset_trim()
-        elif action_value.startswith('trim_set:'):
-            try:
-                _, side, amount = action_value.split(':', 2)
-                value = float(amount)
-            except ValueError:
-                LOGGER.debug('Invalid trim_set value: %s', action_value)
-                return
-            if side == 'left':
-                movement.set_trim(value, movement.trim[1])
-            elif side == 'right':
-                movement.set_trim(movement.trim[0], value)
-        elif action_value.startswith('trim_adj:'):
-            try:
-                _, side, amount = action_value.split(':', 2)
-                value = float(amount)
-            except ValueError:
-                LOGGER.debug('Invalid trim_adj value: %s', action_value)
-                return
-            if side == 'left':
-                movement.adjust_trim(left_delta=value)
-            elif side == 'right':
-                movement.adjust_trim(right_delta=value)
+        parsed = parse_tuning(action_value)
+        if parsed is None:
+            LOGGER.debug('Invalid tuning value: %s', action_value)
+            return
+        op, side, amount = parsed
+        tuning_handlers[op](side, amount)
+
+    # Bound once so the handlers below skip the attribute lookups on every action.
+    speak = voice.speak
+    styled = adapter.apply
+
+    def do_movement(value: str) -> None:
+        if value == 'forward' and wall_guard and not wall_guard.allows_forward():
+            movement.stop()
+            set_motion('stop')
+            speak(wall_phrase)
+            return
+        apply_movement(value)
+
+    autonomy_handlers = {'start': start_autonomy, 'stop': stop_autonomy}
+    gripper_handlers = {'close': gripper.close, 'open': gripper.open, 'toggle': gripper.toggle}
+
+    def do_arms(value: str) -> None:
+        parts = value.split(':')
+        if len(parts) != 3:
+            return
+        mode, left_raw, right_raw = parts
+        try:
+            left_val = float(left_raw)
+            right_val = float(right_raw)
+        except ValueError:
+            return
+        if mode == 'set':
+            gesture_controller.set_positions(left_val, right_val)
+        elif mode == 'set_left':
+            current_left, current_right = gesture_controller.positions
+            gesture_controller.set_positions(left_val, current_right)
+        elif mode == 'set_right':
+            current_left, current_right = gesture_controller.positions
+            gesture_controller.set_positions(current_left, right_val)
+        elif mode == 'adjust':
+            gesture_controller.adjust(left_val, right_val)
+
+    def do_task(value: str) -> None:
+        if value.startswith('grab:'):
+            label = value.split(':', 1)[1]
+            execute(recognizer.plan_grab(label))
+
+    def do_vision(value: str) -> None:
+        label = value.split(':', 1)[1] if value and ':' in value else None
+        speak(styled(recognizer.describe(label)))
+
+    def do_speech(value: str) -> None:
+        speak(styled(value))
+
+    # Built once so each action is a single dict lookup instead of an if/elif ladder.
+    action_handlers = {
+        'movement': do_movement,
+        'autonomy': lambda value: autonomy_handlers.get(value, _ignore_action)(),
+        'gesture': gesture_controller.perform,
+        'gripper': lambda value: gripper_handlers.get(value, _ignore_action)(),
+        'arms': do_arms,
+        'tuning': apply_tuning,
+        'task': do_task,
+        'vision': do_vision,
+        'speech': do_speech,
+    }
 
     def execute(actions: Iterable[Dict[str, str]]) -> None:
+        get_handler = action_handlers.get
         for action in actions:
             typ = action.get('type')
             value = action.get('value', '')
-            if typ == 'movement' and value:
-                if value == 'forward' and wall_guard and not wall_guard.allows_forward():
-                    movement.stop()
-                    current_motion['value'] = 'stop'
-                    voice.speak(adapter.apply("Wall ahead, stopping."))
-                    continue
-                apply_movement(value)
-            elif typ == 'autonomy' and value:
-                if value == 'start':
-                    start_autonomy()
-                elif value == 'stop':
-                    stop_autonomy()
-            elif typ == 'gesture' and value:
-                gesture_controller.perform(value)
-            elif typ == 'gripper' and value:
-                if value == 'close':
-                    gripper.close()
-                elif value == 'open':
-                    gripper.open()
-                elif value == 'toggle':
-                    gripper.toggle()
-            elif typ == 'arms' and value:
-                parts = value.split(':')
-                if len(parts) == 3:
-                    mode, left_raw, right_raw = parts
-                    try:
-                        left_val = float(left_raw)
-                        right_val = float(right_raw)
-                    except ValueError:
-                        continue
-                    if mode == 'set':
-                        gesture_controller.set_positions(left_val, right_val)
-                    elif mode == 'set_left':
-                        current_left, current_right = gesture_controller.positions
-                        gesture_controller.set_positions(left_val, current_right)
-                   elif mode == 'set_right':
-                       current_left, current_right = gesture_controller.positions
-                       gesture_controller.set_positions(current_left, right_val)
-                   elif mode == 'adjust':
-                       gesture_controller.adjust(left_val, right_val)
-            elif typ == 'tuning' and value:
-                apply_tuning(value)
-            elif typ == 'task' and value:
-                if value.startswith('grab:'):
-                    label = value.split(':', 1)[1]
-                    plan = recognizer.plan_grab(label)
-                    execute(plan)
-            elif typ == 'vision':
-                label = None
-                if value and ':' in value:
-                    _, detail = value.split(':', 1)
-                    label = detail
-                speech = recognizer.describe(label)
-                voice.speak(adapter.apply(speech))
-            elif typ == 'speech' and value:
-                voice.speak(adapter.apply(value))
-
-    def battery_thread() -> None:
-        shutdown.monitor_loop(interval_s=15.0)
-
-    thread = threading.Thread(target=battery_thread, daemon=True)
-    thread.start()
-
-    if enable_autonomy:
-        start_autonomy()
+            handler = get_handler(typ)
+            if handler is not None and (value or typ in VALUELESS_ACTIONS):
+                handler(value)
 
     guard_running = True
-    guard_flag = {'notified': False}
 
     def guard_loop() -> None:
         if not wall_guard:
             return
-        while guard_running:
-            if current_motion['value'] == 'forward':
-                if not wall_guard.allows_forward():
-                    movement.stop()
-                    current_motion['value'] = 'stop'
-                    if not guard_flag['notified']:
-                        voice.speak(adapter.apply("Wall ahead, stopping."))
-                        guard_flag['notified'] = True
-                else:
-                    guard_flag['notified'] = False
-            else:
-                guard_flag['notified'] = False
-            time.sleep(0.1)
-
-    guard_thread = None
-    if wall_guard:
-        guard_thread = threading.Thread(target=guard_loop, daemon=True)
-        guard_thread.start()
+        while True:
+            with motion_cv:
+                motion_cv.wait_for(lambda: current_motion[0] == MOTION_FORWARD or not guard_running)
+                if not guard_running:
+                    return
+            if not wall_guard.allows_forward():
+                movement.stop()
+                set_motion('stop')
+                voice.speak(wall_phrase)
+                continue
+            with motion_cv:
+                motion_cv.wait_for(lambda: not guard_running, timeout=GUARD_POLL_S)
+
+    utterances: 'queue.Queue[str]' = queue.Queue()
+    battery_monitor: Optional[threading.Thread] = None
+    guard_worker: Optional[threading.Thread] = None
 
+    # The pool's workers are not daemons, so autonomy is started inside the try:
+    # the finally must always stop it and shut the pool down.
     try:
+        battery_monitor = start_daemon(lambda: shutdown.monitor_loop(interval_s=15.0), 'robot-battery')
+
+        if enable_autonomy:
+            start_autonomy()
+
+        if wall_guard:
+            guard_worker = start_daemon(guard_loop, 'robot-guard')
+
+        # Speech is captured and recognised on the voice's own thread, so the
+        # loop below never sits inside a blocking microphone read.
+        voice.start_background_listen(utterances, timeout=5.0, phrase_time_limit=5.0)
+
         while True:
-            text = voice.listen(timeout=5.0, phrase_time_limit=5.0)
-            if not text:
+            try:
+                text = utterances.get(timeout=LISTEN_POLL_S)
+            except queue.Empty:
                 continue
             lower = text.lower()
             if lower in ('quit', 'shutdown', 'power down'):
                 voice.speak(adapter.apply("Shutting down systems."))
                 break
+            if chatbot.wants_vision(text):
+                # Capture and analyse a frame while the chat model is still thinking.
+                recognizer.prefetch()
             control = chatbot.generate_control_reply(text, persona_text=persona_text)
             speech = adapter.apply(control.get('speech', ''))
             if speech:
@@ -365,11 +470,17 @@ def run_master(
     except KeyboardInterrupt:
         LOGGER.info("Master loop interrupted")
     finally:
-        guard_running = False
-        if guard_thread:
-            guard_thread.join(timeout=0.5)
+        voice.stop_background_listen()
+        with motion_cv:
+            guard_running = False
+            motion_cv.notify_all()
+        if guard_worker:
+            guard_worker.join(timeout=0.5)
         stop_autonomy()
         shutdown.cancel()
+        if battery_monitor:
+            battery_monitor.join(timeout=1.0)
+        workers.shutdown(wait=False, cancel_futures=True)
         movement.stop()
         gesture_controller.close()
         gripper.close_controller()
@@ -420,6 +531,12 @@ def main() -> None:
     parser.add_argument('--yolo-model', help='Path or name for Ultralytics YOLO model (e.g. yolov8n.pt)')
     parser.add_argument('--yolo-conf', type=float, help='Confidence threshold for YOLO detections')
     parser.add_argument('--yolo-classes', nargs='*', type=int, help='Optional class id whitelist for YOLO')
+    parser.add_argument('--yolo-imgsz', type=int, default=320, help='YOLO inference image size (default 320)')
+    parser.add_argument(
+        '--yolo-export',
+        choices=['onnx', 'ncnn'],
+        help='Export a .pt YOLO model to this backend once and run that instead',
+    )
     parser.add_argument('--vision-colors', help='Path to JSON colour profile for perception')
     args = parser.parse_args()
 
@@ -470,6 +587,8 @@ def main() -> None:
         yolo_model=yolo_model,
         yolo_conf=yolo_conf,
         yolo_classes=yolo_classes,
+        yolo_imgsz=args.yolo_imgsz,
+        yolo_export=args.yolo_export or os.environ.get('YOLO_EXPORT'),
         color_config_path=args.vision_colors,
     )
 
@@ -18,27 +18,23 @@ try:
 except Exception:  # pragma: no cover - best effort import guard
     Motor = None
 
-CARDINAL_DIRECTIONS = ('N', 'E', 'S', 'W')
-
-
-def _dir_to_delta(direction: str) -> Tuple[int, int]:
-    """Convert cardinal direction to (dx, dy)."""
-    return {
-        'N': (0, 1),
-        'E': (1, 0),
-        'S': (0, -1),
-        'W': (-1, 0),
-    }[direction]
+try:  # pragma: no cover - optional, only needed for batch simulation
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
 
+CARDINAL_DIRECTIONS = ('N', 'E', 'S', 'W')
 
-def _rotate_left(direction: str) -> str:
-    order = ['N', 'W', 'S', 'E']
-    return order[(order.index(direction) + 1) % 4]
 
+# Simulation lookup tables: per-direction (dx, dy) and the heading after a turn.
+_DIRECTION_DELTAS = {'N': (0, 1), 'E': (1, 0), 'S': (0, -1), 'W': (-1, 0)}
+_LEFT_OF = {'N': 'W', 'W': 'S', 'S': 'E', 'E': 'N'}
+_RIGHT_OF = {'N': 'E', 'E': 'S', 'S': 'W', 'W': 'N'}
 
-def _rotate_right(direction: str) -> str:
-    order = ['N', 'E', 'S', 'W']
-    return order[(order.index(direction) + 1) % 4]
+# Action codes for Movement.simulate_sequence: row ``(code, speed)`` means SEQUENCE_ACTIONS[code].
+SEQUENCE_ACTIONS = ('forward', 'backward', 'left', 'right', 'stop')
+_HEADING_INDEX = {direction: index for index, direction in enumerate(CARDINAL_DIRECTIONS)}
+_HEADING_DELTAS = np.array([_DIRECTION_DELTAS[d] for d in CARDINAL_DIRECTIONS], dtype=float) if np else None
 
 
 class Movement:
@@ -127,7 +123,7 @@ class Movement:
         left, right = self._apply_scaling(-speed, speed)
         self._drive(left, right)
         if not self._hw:
-            self.direction = _rotate_left(self.direction)
+            self.direction = _LEFT_OF[self.direction]
             self._logger.debug("Simulation direction -> %s", self.direction)
 
     def turn_right(self, speed: float = 1.0) -> None:
@@ -136,7 +132,7 @@ class Movement:
         left, right = self._apply_scaling(speed, -speed)
         self._drive(left, right)
         if not self._hw:
-            self.direction = _rotate_right(self.direction)
+            self.direction = _RIGHT_OF[self.direction]
             self._logger.debug("Simulation direction -> %s", self.direction)
 
     def stop(self) -> None:
@@ -145,6 +141,34 @@ class Movement:
         if not self._hw:
             self._logger.debug("Simulation stop")
 
+    def simulate_sequence(self, actions) -> 'np.ndarray':
+        """Replay many commands in one NumPy pass and return the ``(N, 2)`` position after each.
+
+        ``actions`` is an ``(N, 2)`` array of ``(code, speed)`` rows, codes indexing
+        :data:`SEQUENCE_ACTIONS`. The result matches calling the per-step methods in
+        simulation from the current pose, speed scale and trim, but nothing is
+        driven or recorded, so planners can roll out trajectories cheaply.
+        """
+        if np is None:
+            raise RuntimeError("simulate_sequence requires numpy")
+        rows = np.asarray(actions, dtype=float).reshape(-1, 2)
+        codes = rows[:, 0].astype(int)
+        speeds = rows[:, 1]
+        if ((codes < 0) | (codes >= len(SEQUENCE_ACTIONS))).any():
+            raise ValueError("action codes must index SEQUENCE_ACTIONS")
+        if (speeds < 0).any():
+            raise ValueError("speed must be non-negative")
+        speeds = np.minimum(speeds, 1.0)
+        # Headings index CARDINAL_DIRECTIONS clockwise, so left is -1 (== +3) and right is +1.
+        turns = np.where(codes == 2, 3, 0) + np.where(codes == 3, 1, 0)
+        headings = (_HEADING_INDEX[self.direction] + np.cumsum(turns)) % 4
+        signed = np.where(codes == 1, -speeds, speeds)
+        left = self._apply_single_array(signed, self._trim_left)
+        right = self._apply_single_array(signed, self._trim_right)
+        effective = np.where(codes <= 1, (left + right) / 2.0, 0.0)
+        steps = _HEADING_DELTAS[headings] * (effective * self._sim_step)[:, None]
+        return np.asarray(self.position, dtype=float) + np.cumsum(steps, axis=0)
+
     # ------------------------------------------------------------------ tuning
 
     def set_speed_scale(self, value: float) -> None:
@@ -159,6 +183,14 @@ class Movement:
         self._trim_right = self._clamp_trim(right)
         self._logger.info("Motor trim set to left=%.2f right=%.2f", self._trim_left, self._trim_right)
 
+    def set_left_trim(self, value: float) -> None:
+        self._trim_left = self._clamp_trim(value)
+        self._logger.info("Left motor trim set to %.2f", self._trim_left)
+
+    def set_right_trim(self, value: float) -> None:
+        self._trim_right = self._clamp_trim(value)
+        self._logger.info("Right motor trim set to %.2f", self._trim_right)
+
     def adjust_trim(self, left_delta: float = 0.0, right_delta: float = 0.0) -> None:
         self.set_trim(self._trim_left + left_delta, self._trim_right + right_delta)
 
@@ -171,6 +203,9 @@ class Movement:
         self._last_action = (action, speed)
 
     def _clamp_positive(self, speed: float) -> float:
+        if speed == 1.0:
+            # Default speed from every master-loop command; already valid and at the cap.
+            return 1.0
         if speed < 0:
             raise ValueError("speed must be non-negative")
         return min(float(speed), 1.0)
@@ -182,14 +217,19 @@ class Movement:
         )
 
     def _apply_single(self, value: float, trim: float) -> float:
+        # Clamped inline: this runs for both motors on every drive command.
         scaled = value * self._speed_scale
         if value >= 0:
             scaled += trim
-            scaled = max(0.0, scaled)
-        else:
-            scaled -= trim
-            scaled = min(0.0, scaled)
-        return self._clamp_drive(scaled)
+            return 0.0 if scaled < 0.0 else (1.0 if scaled > 1.0 else scaled)
+        scaled -= trim
+        return 0.0 if scaled > 0.0 else (-1.0 if scaled < -1.0 else scaled)
+
+    def _apply_single_array(self, values: 'np.ndarray', trim: float) -> 'np.ndarray':
+        """Vectorised :meth:`_apply_single`."""
+        scaled = values * self._speed_scale
+        shaped = np.where(values >= 0, np.maximum(scaled + trim, 0.0), np.minimum(scaled - trim, 0.0))
+        return np.clip(shaped, -1.0, 1.0)
 
     def _drive(self, left: float, right: float) -> None:
         if self._hw:
@@ -206,7 +246,7 @@ class Movement:
 
     def _advance_translation(self, effective_speed: float) -> None:
         distance = self._sim_step * effective_speed
-        dx, dy = _dir_to_delta(self.direction)
+        dx, dy = _DIRECTION_DELTAS[self.direction]
         self.position[0] += dx * distance
         self.position[1] += dy * distance
         self._logger.debug(
@@ -219,7 +259,3 @@ class Movement:
     @staticmethod
     def _clamp_trim(value: float) -> float:
         return max(-0.5, min(0.5, float(value)))
-
-    @staticmethod
-    def _clamp_drive(value: float) -> float:
-        return max(-1.0, min(1.0, float(value)))
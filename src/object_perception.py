@@ -16,12 +16,16 @@ used for narration and control.
 
 from __future__ import annotations
 
+import concurrent.futures
 import json
 import logging
+import math
 import random
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 try:  # pragma: no cover - optional runtime dependency
     import cv2
@@ -32,6 +36,28 @@ except Exception:  # pragma: no cover - keep simulation working without OpenCV
 
 LOGGER = logging.getLogger(__name__)
 
+# A prefetched observation pass older than this is discarded as stale.
+PREFETCH_MAX_AGE_S = 3.0
+# How long colour detection waits for the grabber's first frame.
+FRAME_WAIT_S = 1.0
+# Frames older than this are rejected, so a stalled camera is not read as a live view.
+FRAME_MAX_AGE_S = 1.0
+# Vision requests arriving this soon after a pass finished share its result, so
+# the several vision/grab actions in one chatbot reply cost a single backend call.
+OBSERVATION_COALESCE_S = 0.25
+# Wait for parallel remote backends when a client does not state its own
+# ``max_request_s`` (the longest one detect() call can take, retries included).
+REMOTE_TIMEOUT_S = 12.0
+# A lower-priority remote backend only starts once those above it have come back
+# empty or stayed silent this long, so a quick local YOLO answer never costs a
+# paid Google request.
+REMOTE_HEDGE_S = 1.0
+# Distinct label queries remembered by resolve_label before the memo is reset.
+LABEL_CACHE_SIZE = 128
+
+# Structuring element for the open/close clean-up of every colour mask.
+_MORPH_KERNEL = np.ones((5, 5), np.uint8) if np is not None else None
+
 HSVRangeMapping = Dict[str, Tuple[int, int]]
 ColorSpec = Dict[str, Union[Tuple[int, int], str, Iterable[str], List[HSVRangeMapping], HSVRangeMapping]]
 
@@ -169,12 +195,47 @@ class ObjectRecognizer:
         camera_index: int = 0,
         color_map: Optional[Dict[str, ColorSpec]] = None,
         remote_client: Optional[object] = None,
+        remote_clients: Sequence[object] = (),
     ) -> None:
         self.simulate = simulate or cv2 is None or np is None
         self.camera_index = camera_index
         self.color_map = self._normalise_color_map(color_map or DEFAULT_COLOR_MAP)
-        self.remote_client = remote_client
+        # resolve_label answers keyed by raw query; cleared whenever the colour map changes.
+        self._label_cache: Dict[str, Optional[str]] = {}
+        self._alias_index = self._build_alias_index(self.color_map)
+        # Several backends (e.g. YOLO, Google, a custom endpoint) are listed in
+        # priority order; the highest-priority one that returns detections answers.
+        self.remote_clients = tuple(client for client in (remote_client, *remote_clients) if client is not None)
+        self.remote_client = self.remote_clients[0] if self.remote_clients else None
+        self._remote_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # Each backend's outstanding call; a backend still busy from an earlier
+        # pass sits the next one out instead of queueing behind itself.
+        self._remote_futures: Dict[int, concurrent.futures.Future] = {}
+        self._remote_lock = threading.Lock()
+        self._remote_timeout_s = max(
+            (getattr(client, 'max_request_s', REMOTE_TIMEOUT_S) for client in self.remote_clients),
+            default=REMOTE_TIMEOUT_S,
+        )
+        if len(self.remote_clients) > 1:
+            self._remote_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self.remote_clients), thread_name_prefix='remote-vision'
+            )
         self._cap = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._prefetch: Optional[Tuple[float, concurrent.futures.Future]] = None
+        self._prefetch_lock = threading.Lock()
+        self._recent: Optional[Tuple[float, List[ObjectObservation]]] = None
+        # Latest-frame slot filled by a grabber thread, started on the first colour pass.
+        self._grabber: Optional[threading.Thread] = None
+        self._grab_running = False
+        self._frame_lock = threading.Lock()
+        self._latest_frame = None
+        self._latest_frame_ts = 0.0
+        self._frame_ready = threading.Event()
+        # HSV image and two mask buffers kept across colour passes, reallocated
+        # only when the frame size changes; the lock serialises passes over them.
+        self._colour_lock = threading.Lock()
+        self._colour_buffers: Optional[Tuple[object, object, object]] = None
         if not self.simulate and cv2 is not None:
             self._cap = cv2.VideoCapture(camera_index)
             if not self._cap or not self._cap.isOpened():
@@ -184,6 +245,56 @@ class ObjectRecognizer:
     # ------------------------------------------------------------------ API
 
     def observations(self) -> List[ObjectObservation]:
+        with self._prefetch_lock:
+            pending, self._prefetch = self._prefetch, None
+            recent = self._recent
+        result = None
+        if pending is not None:
+            started, future = pending
+            if time.monotonic() - started <= PREFETCH_MAX_AGE_S:
+                result = future.result()
+        if result is None and recent is not None and time.monotonic() - recent[0] <= OBSERVATION_COALESCE_S:
+            return list(recent[1])
+        if result is None:
+            result = self._observe()
+        with self._prefetch_lock:
+            self._recent = (time.monotonic(), result)
+        return list(result)
+
+    def latest_observations(self) -> List[ObjectObservation]:
+        """Return the newest finished pass without waiting, keeping a new one running.
+
+        Unlike :meth:`observations` this never blocks on the camera or a remote
+        backend, so a fast control loop can poll it; the result lags by one pass
+        and is empty until the first pass completes.
+        """
+        with self._prefetch_lock:
+            pending = self._prefetch
+            if pending is not None and pending[1].done():
+                self._prefetch = None
+                try:
+                    self._recent = (time.monotonic(), pending[1].result())
+                except Exception as exc:
+                    LOGGER.warning("Background observation pass failed: %s", exc)
+            recent = self._recent
+        self.prefetch()
+        return list(recent[1]) if recent is not None else []
+
+    def prefetch(self) -> None:
+        """Start an observation pass in the background.
+
+        The next :meth:`observations` call (via ``describe``/``locate``/``plan_grab``)
+        consumes the result, so the camera and remote vision round-trip can run
+        while the chat model is still producing its reply.
+        """
+        with self._prefetch_lock:
+            if self._prefetch is not None:
+                return
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='vision')
+            self._prefetch = (time.monotonic(), self._executor.submit(self._observe))
+
+    def _observe(self) -> List[ObjectObservation]:
         remote_observations = self._detect_remote()
         if remote_observations:
             return remote_observations
@@ -199,10 +310,24 @@ class ObjectRecognizer:
         return None
 
     def resolve_label(self, query: str) -> Optional[str]:
+        try:
+            return self._label_cache[query]
+        except KeyError:
+            pass
+        resolved = self._resolve_label_uncached(query)
+        if len(self._label_cache) >= LABEL_CACHE_SIZE:
+            self._label_cache.clear()
+        self._label_cache[query] = resolved
+        return resolved
+
+    def _resolve_label_uncached(self, query: str) -> Optional[str]:
         candidate = query.lower().strip().replace('-', ' ')
         candidate_key = candidate.replace(' ', '_')
         if candidate_key in self.color_map:
             return candidate_key
+        exact = self._alias_index.get(candidate)
+        if exact is not None:
+            return exact
         for label, profile in self.color_map.items():
             pretty = label.replace('_', ' ')
             if candidate in pretty:
@@ -256,6 +381,13 @@ class ObjectRecognizer:
         return actions
 
     def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._remote_pool is not None:
+            self._remote_pool.shutdown(wait=True)
+            self._remote_pool = None
+        self._stop_grabber()
         if self._cap is not None:
             self._cap.release()
 
@@ -281,10 +413,70 @@ class ObjectRecognizer:
     # ---------------------------------------------------------------- detection
 
     def _detect_remote(self) -> List[ObjectObservation]:
-        if not self.remote_client:
+        if not self.remote_clients:
             return []
+        if self._remote_pool is None:
+            return self._remote_observations(self.remote_clients[0])
+        deadline = time.monotonic() + self._remote_timeout_s
+        futures: List[concurrent.futures.Future] = []
+        last = len(self.remote_clients) - 1
+        for index, client in enumerate(self.remote_clients):
+            future = self._submit_remote(index, client)
+            if future is not None:
+                futures.append(future)
+            if index < last:
+                hedge_s = min(REMOTE_HEDGE_S, deadline - time.monotonic())
+                observations = self._best_remote(futures, hedge_s)
+                if observations:
+                    return observations
+        observations = self._best_remote(futures, deadline - time.monotonic())
+        if observations is not None:
+            return observations
+        LOGGER.warning("Remote vision backends timed out after %.0f s", self._remote_timeout_s)
+        # Settle for the best answer that did arrive.
+        for future in futures:
+            if future.done() and future.result():
+                return future.result()
+        return []
+
+    def _submit_remote(self, index: int, client) -> Optional[concurrent.futures.Future]:
+        # A backend still busy from an earlier pass sits this one out.
+        with self._remote_lock:
+            previous = self._remote_futures.get(index)
+            if previous is not None and not previous.done():
+                LOGGER.debug("Remote vision backend %s still busy; skipping it this pass", client)
+                return None
+            future = self._remote_pool.submit(self._remote_observations, client)
+            self._remote_futures[index] = future
+            return future
+
+    @staticmethod
+    def _best_remote(
+        futures: Sequence[concurrent.futures.Future], timeout_s: float
+    ) -> Optional[List[ObjectObservation]]:
+        """Return the highest-priority non-empty result once it is settled.
+
+        ``[]`` means every backend came back empty; None means a higher-priority
+        backend was still running when ``timeout_s`` ran out.
+        """
+        deadline = time.monotonic() + timeout_s
+        while True:
+            for future in futures:
+                if not future.done():
+                    break
+                observations = future.result()
+                if observations:
+                    return observations
+            else:
+                return []
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            concurrent.futures.wait([future], timeout=remaining)
+
+    def _remote_observations(self, client) -> List[ObjectObservation]:
         try:
-            payload = self.remote_client.detect()
+            payload = client.detect()
         except Exception as exc:  # pragma: no cover - network failure
             LOGGER.warning("Remote vision failed: %s", exc)
             return []
@@ -313,31 +505,83 @@ class ObjectRecognizer:
             )
         return observations
 
+    # ---------------------------------------------------------------- capture
+
+    def _start_grabber(self) -> None:
+        self._grab_running = True
+        self._grabber = threading.Thread(target=self._grab_loop, daemon=True)
+        self._grabber.start()
+
+    def _grab_loop(self) -> None:  # pragma: no cover - requires a camera
+        while self._grab_running:
+            success, frame = self._cap.read()
+            if not success:
+                time.sleep(0.05)
+                continue
+            with self._frame_lock:
+                self._latest_frame = frame
+                self._latest_frame_ts = time.monotonic()
+            self._frame_ready.set()
+
+    def _stop_grabber(self) -> None:
+        if self._grabber is None:
+            return
+        self._grab_running = False
+        self._grabber.join(timeout=1.0)
+        self._grabber = None
+
+    def _current_frame(self):
+        """Newest camera frame without waiting on the camera; None if none is fresh."""
+        with self._frame_lock:
+            if self._grabber is None:
+                self._start_grabber()
+        if not self._frame_ready.wait(timeout=FRAME_WAIT_S):
+            return None
+        with self._frame_lock:
+            frame, stamp = self._latest_frame, self._latest_frame_ts
+        if time.monotonic() - stamp > FRAME_MAX_AGE_S:
+            return None
+        return frame
+
     def _detect_colours(self) -> List[ObjectObservation]:  # pragma: no cover
-        assert cv2 is not None and np is not None
         if not self._cap:
             return []
-        success, frame = self._cap.read()
-        if not success:
+        frame = self._current_frame()
+        if frame is None:
             LOGGER.warning("Failed to read frame from camera")
             return []
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        return self._detect_colours_in(frame)
+
+    def _detect_colours_in(self, frame) -> List[ObjectObservation]:  # pragma: no cover
+        assert cv2 is not None and np is not None
+        with self._colour_lock:
+            buffers = self._colour_buffers
+            if buffers is None or buffers[0].shape != frame.shape:
+                height, width = frame.shape[:2]
+                mask = np.empty((height, width), np.uint8)
+                buffers = self._colour_buffers = (np.empty_like(frame), mask, np.empty_like(mask))
+            hsv, mask, scratch = buffers
+            cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
+            return self._colour_pass(hsv, mask, scratch)
+
+    def _colour_pass(self, hsv, mask, scratch) -> List[ObjectObservation]:  # pragma: no cover
+        # Ranges are thresholded and OR-ed into ``mask`` in place, and the
+        # open/close ping-pongs between ``mask`` and ``scratch``, so a pass
+        # allocates no frame-sized arrays.
         height, width = hsv.shape[:2]
-        kernel = np.ones((5, 5), np.uint8)
         observations: List[ObjectObservation] = []
         for label, profile in self.color_map.items():
-            masks: List[np.ndarray] = []
-            for hsv_range in profile['ranges']:
-                lower = np.array([hsv_range['h'][0], hsv_range['s'][0], hsv_range['v'][0]])
-                upper = np.array([hsv_range['h'][1], hsv_range['s'][1], hsv_range['v'][1]])
-                masks.append(cv2.inRange(hsv, lower, upper))
-            if not masks:
+            ranges = profile['ranges']
+            if not ranges:
                 continue
-            mask = masks[0]
-            for extra in masks[1:]:
-                mask = cv2.bitwise_or(mask, extra)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+            for index, hsv_range in enumerate(ranges):
+                if index == 0:
+                    cv2.inRange(hsv, hsv_range['lower'], hsv_range['upper'], dst=mask)
+                else:
+                    cv2.inRange(hsv, hsv_range['lower'], hsv_range['upper'], dst=scratch)
+                    cv2.bitwise_or(mask, scratch, dst=mask)
+            cv2.morphologyEx(mask, cv2.MORPH_OPEN, _MORPH_KERNEL, dst=scratch)
+            cv2.morphologyEx(scratch, cv2.MORPH_CLOSE, _MORPH_KERNEL, dst=mask)
             contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             if not contours:
                 continue
@@ -390,8 +634,7 @@ class ObjectRecognizer:
     def _estimate_distance(contour_area: float, frame_area: float) -> float:
         if frame_area <= 0 or contour_area <= 0:
             return 60.0
-        coverage = contour_area / frame_area
-        distance = 200.0 * (coverage ** -0.5)
+        distance = 200.0 * math.sqrt(frame_area / contour_area)
         return max(8.0, min(distance, 120.0))
 
     # ---------------------------------------------------------------- config
@@ -433,6 +676,11 @@ class ObjectRecognizer:
                 ranges.append(ObjectRecognizer._validate_hsv({'h': spec['h'], 's': spec['s'], 'v': spec['v']}, label))
             else:
                 raise ValueError(f'Colour profile for {label} lacks HSV range information')
+            if np is not None:
+                # inRange bounds built once here rather than twice per range on every frame.
+                for hsv_range in ranges:
+                    hsv_range['lower'] = ObjectRecognizer._hsv_bound(hsv_range, 0)
+                    hsv_range['upper'] = ObjectRecognizer._hsv_bound(hsv_range, 1)
 
             normalised[label] = {
                 'color': colour,
@@ -442,6 +690,26 @@ class ObjectRecognizer:
             }
         return normalised
 
+    @staticmethod
+    def _build_alias_index(color_map: Dict[str, Dict[str, object]]) -> Dict[str, str]:
+        """Map each spelled-out label, alias and "colour shape" phrase to its label.
+
+        resolve_label answers exact phrases with one lookup here and only scans
+        profiles for partial matches. Earlier profiles win a shared phrase.
+        """
+        index: Dict[str, str] = {}
+        for label, profile in color_map.items():
+            index.setdefault(label.replace('_', ' '), label)
+            index.setdefault(f"{profile['color']} {profile['shape']}", label)
+            for alias in profile['aliases']:
+                index.setdefault(alias.lower().replace('-', ' '), label)
+        return index
+
+    @staticmethod
+    def _hsv_bound(hsv_range: HSVRangeMapping, end: int):
+        bound = (hsv_range['h'][end], hsv_range['s'][end], hsv_range['v'][end])
+        return np.clip(bound, 0, 255).astype(np.uint8)
+
     @staticmethod
     def _validate_hsv(entry: ColorSpec, label: str) -> HSVRangeMapping:
         try:
@@ -458,3 +726,5 @@ class ObjectRecognizer:
         """Merge additional colour profiles into the recogniser."""
 
         self.color_map.update(self._normalise_color_map(extra))
+        self._alias_index = self._build_alias_index(self.color_map)
+        self._label_cache.clear()
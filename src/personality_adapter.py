@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from typing import Callable, Dict, Optional
 
@@ -21,15 +22,23 @@ class PersonalityAdapter:
         return styled
 
     def _apply_base_style(self, message: str) -> str:
-        tone = self.persona.get('tone', 'playful')
-        catchphrase = self.persona.get('catchphrase', '')
-        prefix = self.persona.get('prefix', 'WALL-E:')
-        suffix = f" {catchphrase}" if catchphrase else ''
-        if tone == 'sarcastic':
-            message = f"Oh sure, {message.lower()}"
-        elif tone == 'excited':
-            message = f"{message}!"
-        return f"{prefix} {message}{suffix}"
+        return _styled(
+            message,
+            self.persona.get('tone', 'playful'),
+            self.persona.get('prefix', 'WALL-E:'),
+            self.persona.get('catchphrase', ''),
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _styled(message: str, tone: str, prefix: str, catchphrase: str) -> str:
+    # Keyed on the persona fields as well, so editing the persona never serves a stale string.
+    suffix = f" {catchphrase}" if catchphrase else ''
+    if tone == 'sarcastic':
+        message = f"Oh sure, {message.lower()}"
+    elif tone == 'excited':
+        message = f"{message}!"
+    return f"{prefix} {message}{suffix}"
 
 
 DEFAULT_PERSONA: Persona = {
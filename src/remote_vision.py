@@ -9,21 +9,41 @@ from typing import Dict, List, Optional
 try:  # pragma: no cover - optional dependency
     import cv2
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except Exception:  # pragma: no cover
     cv2 = None  # type: ignore
     requests = None  # type: ignore
 
 LOGGER = logging.getLogger(__name__)
 
+# (connect, read) seconds: fail fast when offline but give inference time to run.
+REQUEST_TIMEOUT = (2.0, 10.0)
+# Worst case for one detect(): a failed connect, its single retry, then the read.
+MAX_REQUEST_S = 2 * REQUEST_TIMEOUT[0] + REQUEST_TIMEOUT[1]
+
 
 class RemoteVisionClient:
     """Capture frames from the Pi camera and send them to a vision API."""
 
+    # Upper bound on one detect() call, used by ObjectRecognizer to size its wait.
+    max_request_s = MAX_REQUEST_S
+
     def __init__(self, api_url: str, api_key: str, camera_index: int = 0) -> None:
         if cv2 is None or requests is None:
             raise RuntimeError("remote_vision requires opencv-python and requests installed")
         self.api_url = api_url
         self.api_key = api_key
+        # One keep-alive session per client so each detect() skips the TCP/TLS handshake.
+        # The API's POST semantics are unknown, so only failed connects are retried.
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=1, read=False))
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
         self.cap = cv2.VideoCapture(camera_index)
         if not self.cap or not self.cap.isOpened():
             raise RuntimeError(f"Failed to open camera index {camera_index}")
@@ -42,11 +62,7 @@ class RemoteVisionClient:
         payload = {
             'image_base64': base64.b64encode(frame_bytes).decode('utf-8'),
         }
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-        }
-        resp = requests.post(self.api_url, json=payload, headers=headers, timeout=10)
+        resp = self._session.post(self.api_url, json=payload, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         return data.get('detections', [])
@@ -54,3 +70,5 @@ class RemoteVisionClient:
     def close(self) -> None:
         if self.cap:
             self.cap.release()
+            self.cap = None
+        self._session.close()
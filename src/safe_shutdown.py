@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
-import time
+import threading
 from typing import Optional
 
 from src.battery_check import BatteryMonitor
@@ -20,6 +20,8 @@ class SafeShutdown:
         self.logger = logger or LOGGER
         self.simulate = simulate
         self._shutdown_initiated = False
+        # Set on shutdown or cancel() so monitor_loop wakes immediately instead of finishing its sleep.
+        self._stopped = threading.Event()
 
     def check_once(self) -> str:
         status = self.monitor.classify()
@@ -33,10 +35,12 @@ class SafeShutdown:
     def monitor_loop(self, interval_s: float = 10.0) -> None:
         while not self._shutdown_initiated:
             self.check_once()
-            time.sleep(interval_s)
+            if self._stopped.wait(interval_s):
+                break
 
     def _initiate_shutdown(self, voltage: float) -> None:
         self._shutdown_initiated = True
+        self._stopped.set()
         self.logger.error("Critical battery %.2fV - stopping motors and shutting down", voltage)
         self.movement.stop()
         if self.simulate:
@@ -49,3 +53,4 @@ class SafeShutdown:
 
     def cancel(self) -> None:
         self._shutdown_initiated = True
+        self._stopped.set()
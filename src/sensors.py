@@ -5,8 +5,9 @@ gpiozero.DistanceSensor when available, with a simulation fallback for
 development machines.
 """
 
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 try:
     from gpiozero import DistanceSensor  # type: ignore[reportMissingImports]
@@ -32,6 +33,28 @@ class UltrasonicSensor:
         else:
             self._sensor = None
 
+    @property
+    def device(self):
+        """Underlying gpiozero DistanceSensor, or None in simulation."""
+        return self._sensor
+
+    def watch_threshold(self, threshold_cm: float, callback: Optional[Callable[[], None]]) -> bool:
+        """Call ``callback`` whenever the reading crosses ``threshold_cm``.
+
+        Uses gpiozero's edge-driven in/out-of-range events. Returns False when
+        no hardware is attached (simulation), in which case callers should
+        keep polling. Pass ``callback=None`` to unhook.
+        """
+        if self._sensor is None:
+            return False
+        try:
+            self._sensor.threshold_distance = threshold_cm / 100.0
+            self._sensor.when_in_range = callback
+            self._sensor.when_out_of_range = callback
+        except Exception:  # pragma: no cover - requires hardware
+            return False
+        return callback is not None
+
     def set_simulated_distance(self, cm: Optional[float]):
         """Override the simulated distance (cm). None restores auto pattern."""
         self._sim_value_cm = cm
@@ -61,26 +84,57 @@ class UltrasonicSensor:
 
 
 class DistanceSensorWrapper:
-    """Higher-level helper with caching and shutdown support."""
+    """Higher-level helper with caching and shutdown support.
 
-    def __init__(self, *, echo: Optional[int] = None, trigger: Optional[int] = None, simulate: bool = False):
+    One wrapper can be shared by several consumers (wall guard, autonomy).
+    Reads are serialised so the sensor is never queried twice at once, and a
+    reading younger than ``max_age_s`` is handed to the next caller instead of
+    querying again.
+    """
+
+    def __init__(
+        self,
+        *,
+        echo: Optional[int] = None,
+        trigger: Optional[int] = None,
+        simulate: bool = False,
+        max_age_s: float = 0.0,
+    ):
         self._sensor = UltrasonicSensor(echo=echo, trigger=trigger, simulate=simulate)
+        self._max_age_s = max_age_s
+        self._lock = threading.Lock()
         self._last_read_cm: Optional[float] = None
+        self._last_read_at = 0.0
 
     @property
     def distance_cm(self) -> float:
-        reading = self._sensor.read_distance_cm()
-        if reading is None:
-            return -1.0
-        self._last_read_cm = reading
-        return reading
+        with self._lock:
+            now = time.monotonic()
+            if self._last_read_cm is not None and now - self._last_read_at < self._max_age_s:
+                return self._last_read_cm
+            reading = self._sensor.read_distance_cm()
+            if reading is None:
+                return -1.0
+            self._last_read_cm = reading
+            self._last_read_at = now
+            return reading
+
+    @property
+    def device(self):
+        """Underlying gpiozero device, or None in simulation."""
+        return self._sensor.device
+
+    def watch_threshold(self, threshold_cm: float, callback: Optional[Callable[[], None]]) -> bool:
+        return self._sensor.watch_threshold(threshold_cm, callback)
 
     def set_simulated_distance(self, cm: Optional[float]) -> None:
         self._sensor.set_simulated_distance(cm)
+        with self._lock:
+            self._last_read_cm = None
 
     def close(self) -> None:
         # gpiozero sensors expose close(); simulation ignores it
-        sensor = getattr(self._sensor, '_sensor', None)
+        sensor = self._sensor.device
         if sensor is not None:
             try:
                 sensor.close()  # type: ignore[attr-defined]
@@ -0,0 +1,105 @@
+"""Shared servo construction for the arms and gripper."""
+
+from __future__ import annotations
+
+import functools
+import logging
+from typing import Optional
+
+LOGGER = logging.getLogger(__name__)
+
+try:  # pragma: no cover - optional hardware dependency
+    from gpiozero import Servo  # type: ignore
+    from gpiozero.pins.pigpio import PiGPIOFactory  # type: ignore
+except Exception:  # pragma: no cover - fall back when unavailable
+    Servo = None  # type: ignore
+    PiGPIOFactory = None  # type: ignore
+
+try:  # pragma: no cover - optional hardware dependency
+    import pigpio  # type: ignore
+except Exception:  # pragma: no cover
+    pigpio = None  # type: ignore
+
+# Standard hobby-servo pulse range, stated explicitly so pigpio times it in hardware.
+SERVO_MIN_PULSE_S = 0.001
+SERVO_MAX_PULSE_S = 0.002
+# Position changes smaller than this are not worth a pulse-width rewrite.
+SERVO_DEADBAND = 1e-3
+# The same range in the microseconds pigpio's set_servo_pulsewidth takes.
+SERVO_CENTER_US = int((SERVO_MIN_PULSE_S + SERVO_MAX_PULSE_S) * 0.5e6)
+SERVO_HALF_RANGE_US = int((SERVO_MAX_PULSE_S - SERVO_MIN_PULSE_S) * 0.5e6)
+
+
+@functools.lru_cache(maxsize=None)
+def servo_pin_factory() -> Optional[object]:
+    """Return one shared pigpio pin factory, or ``None`` for gpiozero's default.
+
+    pigpio generates servo pulses with DMA timing, so there is no jitter and no
+    Python wake-ups per pulse. It needs the daemon running (``sudo pigpiod``);
+    without it this logs a warning and the default software PWM is used.
+    """
+    if PiGPIOFactory is None:
+        return None
+    try:  # pragma: no cover - hardware specific
+        return PiGPIOFactory()
+    except Exception as exc:  # pragma: no cover
+        LOGGER.warning("pigpio unavailable (%s); servos fall back to software PWM", exc)
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def pigpio_connection() -> Optional[object]:
+    """Return one shared connection to ``pigpiod``, or ``None`` if it is not running."""
+    if pigpio is None:
+        return None
+    try:  # pragma: no cover - hardware specific
+        pi = pigpio.pi()
+    except Exception as exc:  # pragma: no cover
+        LOGGER.warning("pigpio connection failed (%s)", exc)
+        return None
+    if not pi.connected:  # pragma: no cover - hardware specific
+        return None
+    return pi
+
+
+class PigpioServo:
+    """Minimal ``gpiozero.Servo`` stand-in that writes pulse widths straight to pigpiod.
+
+    Setting ``value`` is one ``set_servo_pulsewidth`` call, skipping gpiozero's
+    property, range-mapping and source machinery on every arm or gripper move.
+    """
+
+    def __init__(self, pi, pin: int) -> None:
+        self._pi = pi
+        self.pin = pin
+        self._value = 0.0
+        # gpiozero servos start centred; do the same so callers' deadbands line up.
+        self.value = 0.0
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, value: float) -> None:
+        self._pi.set_servo_pulsewidth(self.pin, SERVO_CENTER_US + int(value * SERVO_HALF_RANGE_US))
+        self._value = value
+
+    def close(self) -> None:
+        # A zero pulse width stops the pulse train and lets the servo go limp.
+        self._pi.set_servo_pulsewidth(self.pin, 0)
+
+
+def make_servo(pin: int):
+    """Create a servo on ``pin``, driven directly by pigpio when the daemon is reachable."""
+    pi = pigpio_connection()
+    if pi is not None:
+        return PigpioServo(pi, pin)
+    if Servo is None:
+        raise RuntimeError('gpiozero is required to drive servos without pigpiod')
+    return Servo(
+        pin,
+        min_pulse_width=SERVO_MIN_PULSE_S,
+        max_pulse_width=SERVO_MAX_PULSE_S,
+        pin_factory=servo_pin_factory(),
+    )
@@ -19,12 +19,13 @@ def main() -> None:
     parser = argparse.ArgumentParser(description='Ask the robot what it sees (simulation friendly)')
     parser.add_argument('--simulate', action='store_true')
     parser.add_argument('--device', type=int, default=0)
+    parser.add_argument('--face-model', help='Optional YuNet ONNX model for faster face detection')
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO)
     persona = PersonalityAdapter(DEFAULT_PERSONA)
     voice = Voice(simulate=args.simulate)
-    vision = CameraVision(device=args.device, simulate=args.simulate)
+    vision = CameraVision(device=args.device, simulate=args.simulate, detector_model=args.face_model)
 
     try:
         for idx, frame in enumerate(vision.frames()):
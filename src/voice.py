@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
 from typing import Any, Optional, Sequence
 
 try:  # pragma: no cover - import depends on environment
@@ -101,6 +104,12 @@ class Voice:
 
         self._simulate = self._simulate_input and self._simulate_output
 
+        self._listener: Optional[threading.Thread] = None
+        self._listener_stop = threading.Event()
+        # Monotonic time the last spoken message finished (inf while speaking);
+        # the background listener drops anything it heard over our own voice.
+        self._speech_done_at = 0.0
+
     @property
     def is_simulation(self) -> bool:
         """Return True when both speech directions are simulated."""
@@ -120,13 +129,70 @@ class Voice:
         rendered = f"Speaking: {message}"
         if self._simulate_output or not self._tts_engine:
             return rendered
+        self._speech_done_at = float('inf')
         try:
             self._tts_engine.say(message)
             self._tts_engine.runAndWait()
         except Exception as exc:  # pragma: no cover - runtime failure
             self._logger.warning("Text-to-speech failed: %s", exc)
+        finally:
+            self._speech_done_at = time.monotonic()
         return rendered
 
+    def start_background_listen(
+        self,
+        utterances: 'queue.Queue[str]',
+        *,
+        timeout: Optional[float] = None,
+        phrase_time_limit: Optional[float] = None,
+    ) -> bool:
+        """Recognise speech continuously on a daemon thread, putting each utterance on ``utterances``.
+
+        Returns False (and starts nothing) when microphone input is simulated.
+        """
+        if self._simulate_input:
+            return False
+        if self._listener is not None:
+            return True
+        self._listener_stop.clear()
+        self._listener = threading.Thread(
+            target=self._listen_loop,
+            args=(utterances, timeout, phrase_time_limit),
+            daemon=True,
+        )
+        self._listener.start()
+        return True
+
+    def stop_background_listen(self) -> None:
+        if self._listener is None:
+            return
+        self._listener_stop.set()
+        # A capture in progress finishes on its own timeout; the thread is a daemon.
+        self._listener.join(timeout=0.1)
+        self._listener = None
+
+    def _listen_loop(
+        self,
+        utterances: 'queue.Queue[str]',
+        timeout: Optional[float],
+        phrase_time_limit: Optional[float],
+    ) -> None:
+        while not self._listener_stop.is_set():
+            started = time.monotonic()
+            try:
+                text = self.listen(timeout=timeout, phrase_time_limit=phrase_time_limit)
+            except Exception as exc:
+                # Includes speech_recognition's WaitTimeoutError when nobody spoke.
+                self._logger.debug("Background listen: %s", exc)
+                self._listener_stop.wait(0.1)
+                continue
+            if not text or self._listener_stop.is_set():
+                continue
+            if self._speech_done_at > started:
+                self._logger.debug("Dropping utterance heard while speaking: %s", text)
+                continue
+            utterances.put(text)
+
     def listen(
         self,
         command: Optional[str] = None,
@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+
+from src.auto_drive import AutoDriveConfig, AutoDriver
+from src.movement import Movement
+from src.sensors import DistanceSensorWrapper
+
+
+class TestAutoDriver(unittest.TestCase):
+
+    def setUp(self):
+        self.movement = Movement(simulate=True)
+        self.sensor = DistanceSensorWrapper(simulate=True)
+        config = AutoDriveConfig(reverse_duration_s=0.0, turn_duration_s=0.0, poll_interval_s=5.0)
+        self.driver = AutoDriver(movement=self.movement, sensor=self.sensor, config=config)
+
+    def test_step_moves_forward_when_clear(self):
+        self.sensor.set_simulated_distance(100.0)
+        self.driver.step()
+        self.assertEqual(self.movement.last_action[0], 'forward')
+
+    def test_step_avoids_obstacle(self):
+        self.sensor.set_simulated_distance(10.0)
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'reverse')
+        self.assertEqual(self.movement.last_action[0], 'backward')
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'turn')
+        self.sensor.set_simulated_distance(100.0)
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'drive')
+        self.assertEqual(self.movement.last_action, ('stop', 0.0))
+        self.assertEqual(self.movement.direction, 'E')
+
+    def test_turn_extended_while_path_blocked(self):
+        self.sensor.set_simulated_distance(10.0)
+        self.driver.step()
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'turn')
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'turn')
+        self.assertEqual(self.movement.last_action[0], 'turn_right')
+        self.sensor.set_simulated_distance(100.0)
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'drive')
+
+    def test_turn_extensions_are_capped(self):
+        self.sensor.set_simulated_distance(10.0)
+        self.driver.step()
+        for _ in range(1 + self.driver.config.max_turn_extensions):
+            self.driver.step()
+            self.assertEqual(self.driver.state, 'turn')
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'drive')
+
+    def test_single_glitch_is_filtered(self):
+        for reading in (100.0, 100.0, 5.0):
+            self.sensor.set_simulated_distance(reading)
+            self.driver.step()
+        self.assertEqual(self.movement.last_action[0], 'forward')
+
+    def test_sudden_obstacle_avoided_within_two_polls(self):
+        for _ in range(3):
+            self.sensor.set_simulated_distance(100.0)
+            self.driver.step()
+        self.sensor.set_simulated_distance(10.0)
+        ticks = 0
+        while self.driver.state == 'drive' and ticks < 5:
+            self.driver.step()
+            ticks += 1
+        self.assertEqual(ticks, 2)
+
+    def test_threshold_event_bypasses_median(self):
+        for _ in range(3):
+            self.sensor.set_simulated_distance(100.0)
+            self.driver.step()
+        self.sensor.set_simulated_distance(10.0)
+        self.driver._on_threshold()
+        self.driver.step()
+        self.assertEqual(self.driver.state, 'reverse')
+
+    def test_polls_quickly_near_threshold(self):
+        config = AutoDriveConfig(poll_interval_s=0.1, max_idle_s=0.5)
+        driver = AutoDriver(movement=self.movement, sensor=self.sensor, config=config)
+        self.sensor.set_simulated_distance(150.0)
+        driver.step()
+        self.assertEqual(driver._next_wait(config.max_idle_s), 0.5)
+        self.sensor.set_simulated_distance(40.0)
+        driver.step()
+        self.assertEqual(driver._next_wait(config.max_idle_s), 0.1)
+
+    def test_out_of_range_reading_ignored(self):
+        self.sensor.set_simulated_distance(0.5)
+        self.driver.step()
+        self.assertEqual(self.movement.last_action, ('stop', 0.0))
+        self.assertEqual(self.movement.direction, 'N')
+
+    def test_stop_wakes_running_loop(self):
+        self.sensor.set_simulated_distance(100.0)
+        thread = threading.Thread(target=self.driver.run, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 1.0
+        while self.movement.last_action[0] != 'forward' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.driver.stop()
+        thread.join(timeout=1.0)
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,15 @@ class TestBatteryMonitor(unittest.TestCase):
         monitor = BatteryMonitor(lambda: readings[0], config=config)
         self.assertEqual(monitor.classify(), 'low')
 
+    def test_sample_many_matches_sequential(self):
+        readings = [12.0, 11.0, 12.5, 11.5]
+        bulk = BatteryMonitor(iter(readings).__next__, config=BatteryConfig(smoothing=0.5))
+        single = BatteryMonitor(iter(readings).__next__, config=BatteryConfig(smoothing=0.5))
+        history = bulk.sample_many(len(readings))
+        expected = [single.sample() for _ in readings]
+        self.assertEqual(history, expected)
+        self.assertEqual(bulk.voltage, expected[-1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,39 @@
+import time
+import unittest
+from unittest import mock
+
+from src.camera_vision import CameraVision
+
+
+class UnpluggedCapture:
+    def __init__(self):
+        self.grabs = 0
+
+    def grab(self):
+        self.grabs += 1
+        return False
+
+    def release(self):
+        pass
+
+
+class TestCameraVision(unittest.TestCase):
+
+    def test_failed_grabs_queue_a_single_marker(self):
+        vision = CameraVision(simulate=True, threaded=False)
+        capture = UnpluggedCapture()
+        vision._capture = capture
+        with mock.patch('src.camera_vision.GRAB_RETRY_S', 0.01):
+            vision._start_grabber()
+            time.sleep(0.2)
+            self.assertGreater(capture.grabs, 3)
+            self.assertEqual(vision._ready_slots.qsize(), 1)
+            self.assertIsNone(vision._ready_slots.get_nowait())
+            vision._failure_queued = False
+            time.sleep(0.1)
+            self.assertEqual(vision._ready_slots.qsize(), 1)
+            vision._stop_grabber()
+
+
+if __name__ == '__main__':
+    unittest.main()
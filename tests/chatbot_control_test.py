@@ -1,7 +1,7 @@
 import os
 import unittest
 
-from src.chatbot import Chatbot
+from src.chatbot import _SINGLE_WORD_ACTIONS, Chatbot
 
 
 class TestChatbotControl(unittest.TestCase):
@@ -41,6 +41,32 @@ class TestChatbotControl(unittest.TestCase):
         result = self.bot.generate_control_reply('Do you see the orange mug?')
         self.assertTrue(any(a['type'] == 'vision' and a['value'] == 'describe:orange_mug' for a in result['actions']))
 
+    def test_overlapping_object_phrases_follow_table_order(self):
+        # 'cube' is listed before 'black cube', so it wins as in the original table scan.
+        result = self.bot.generate_control_reply('Grab the black cube')
+        self.assertTrue(any(a['type'] == 'task' and a['value'] == 'grab:red_cube' for a in result['actions']))
+        result = self.bot.generate_control_reply('Grab the coffee mug')
+        self.assertTrue(any(a['type'] == 'task' and a['value'] == 'grab:orange_mug' for a in result['actions']))
+
+    def test_wants_vision(self):
+        self.assertTrue(self.bot.wants_vision('What do you see?'))
+        self.assertTrue(self.bot.wants_vision('Pick up the mug'))
+        self.assertFalse(self.bot.wants_vision('Drive forward'))
+
+    def test_single_word_shortcuts_match_rules(self):
+        for word in _SINGLE_WORD_ACTIONS:
+            self.assertEqual(self.bot._infer_actions(word.title() + '!'), self.bot._infer_rule_actions(word), word)
+
+    def test_parse_control_json(self):
+        parsed = self.bot._parse_control_json('{"speech": "Hi", "actions": [{"type": "Gesture", "value": "WAVE"}, 3]}')
+        self.assertEqual(parsed, {'speech': 'Hi', 'actions': [{'type': 'gesture', 'value': 'wave'}]})
+        self.assertIsNone(self.bot._parse_control_json('[1, 2]'))
+        self.assertIsNone(self.bot._parse_control_json('not json'))
+
+    def test_yes_with_head_nods(self):
+        result = self.bot.generate_control_reply('Say yes with your head')
+        self.assertIn({'type': 'gesture', 'value': 'nod'}, result['actions'])
+
     def test_arm_adjustment(self):
         result = self.bot.generate_control_reply('Raise left arm and lower right arm')
         self.assertTrue(any(a['type'] == 'arms' and a['value'].startswith('adjust:0.200:0.000') for a in result['actions']))
@@ -1,6 +1,15 @@
+import threading
+import time
 import unittest
+from types import SimpleNamespace
+from unittest import mock
 
-from src.chatbot import Chatbot
+from src import chatbot
+from src.chatbot import Chatbot, RateLimiter, ReplyCache
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
 
 
 class TestChatbotFallback(unittest.TestCase):
@@ -10,6 +19,204 @@ class TestChatbotFallback(unittest.TestCase):
         self.assertIsInstance(reply, str)
         self.assertIn('I heard:', reply)
 
+    def test_prompt_resolved_from_attitude(self):
+        self.assertIn('grumpy', Chatbot(attitude='grumpy', simulate=True)._build_prompt())
+        self.assertIn('friendly', Chatbot(attitude='unknown', simulate=True)._build_prompt())
+
+    @mock.patch.dict('os.environ', {'OPENAI_API_KEY': ''})
+    def test_reply_sentences_fallback_without_openai(self):
+        bot = Chatbot(attitude='friendly', simulate=True)
+        self.assertEqual(list(bot.reply_sentences('hi')), [bot.generate_reply('hi')])
+
+    def test_canned_reply_per_attitude(self):
+        self.assertTrue(Chatbot(attitude='grumpy', simulate=True)._canned_reply('x').startswith('Ugh.'))
+        self.assertTrue(Chatbot(attitude='unknown', simulate=True)._canned_reply('x').startswith('I heard: x.'))
+
+
+class TestStreamCompletion(unittest.TestCase):
+    def test_yields_sentences_as_they_complete(self):
+        bot = Chatbot(simulate=True)
+        create = mock.Mock(return_value=iter([_chunk('Hello the'), _chunk('re. How are'), _chunk(' you? Fine'), _chunk(None)]))
+        bot._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        with mock.patch.object(chatbot, '_HAS_OPENAI_V1', True), mock.patch.object(chatbot, '_OpenAIClient', object, create=True):
+            self.assertEqual(list(bot.stream_completion('p', 'hi')), ['Hello there.', 'How are you?', 'Fine'])
+        self.assertTrue(create.call_args.kwargs['stream'])
+
+    @mock.patch.dict('os.environ', {'OPENAI_API_KEY': 'test'})
+    def test_persona_follows_invariant_control_prompt(self):
+        reply = SimpleNamespace(message=SimpleNamespace(content='{"speech": "ok", "actions": []}'))
+        create = mock.Mock(return_value=SimpleNamespace(choices=[reply]))
+        with mock.patch.object(chatbot, '_HAS_OPENAI', True), mock.patch.object(chatbot, '_HAS_OPENAI_V1', True), \
+                mock.patch.object(chatbot, '_OpenAIClient', object, create=True):
+            bot = Chatbot(simulate=True)
+            bot._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+            bot.generate_control_reply('hi', persona_text='A rusty robot.')
+        messages = create.call_args.kwargs['messages']
+        self.assertEqual(messages[0]['content'], chatbot.CONTROL_SYSTEM_PROMPT)
+        self.assertIn('A rusty robot.', messages[1]['content'])
+        self.assertEqual(messages[2], {'role': 'user', 'content': 'hi'})
+
+
+class TestBatchControl(unittest.TestCase):
+    @mock.patch.dict('os.environ', {'OPENAI_API_KEY': 'test'})
+    def test_batch_results_in_order_with_fallback(self):
+        bot = Chatbot(simulate=True, control_mode=True)
+        output = '\n'.join([
+            '{"custom_id": "1", "response": {"body": {"choices": [{"message": {"content": "not json"}}]}}}',
+            '{"custom_id": "0", "response": {"body": {"choices": [{"message": '
+            '{"content": "{\\"speech\\": \\"hi\\", \\"actions\\": []}"}}]}}}',
+        ])
+        files = mock.Mock()
+        files.create.return_value = SimpleNamespace(id='file-in')
+        files.content.return_value = SimpleNamespace(text=output)
+        batches = mock.Mock()
+        batches.create.return_value = SimpleNamespace(id='b1', status='in_progress', output_file_id=None)
+        batches.retrieve.return_value = SimpleNamespace(id='b1', status='completed', output_file_id='file-out')
+        bot._client = SimpleNamespace(files=files, batches=batches)
+        with mock.patch.object(chatbot, '_HAS_OPENAI_V1', True), \
+                mock.patch.object(chatbot, '_OpenAIClient', object, create=True):
+            results = bot.batch_generate_control(['hello', 'move forward'], poll_s=0.0)
+        self.assertEqual(results[0], {'speech': 'hi', 'actions': []})
+        self.assertIn({'type': 'movement', 'value': 'forward'}, results[1]['actions'])
+        self.assertEqual(files.create.call_args.kwargs['purpose'], 'batch')
+
+
+class TestSttWorker(unittest.TestCase):
+    def test_decodes_queued_blocks_until_sentinel(self):
+        bot = Chatbot(simulate=True)
+        rec = mock.Mock()
+        rec.AcceptWaveform.side_effect = lambda block: block == b'end'
+        rec.Result.return_value = '{\n  "text" : "hello robot"\n}'
+        free = bot._audio_pool.qsize()
+        for data in (b'part', b'end'):
+            buffer = bot._audio_pool.get_nowait()
+            buffer[:] = data
+            bot._audio_queue.put(buffer)
+        bot._audio_queue.put(None)
+        bot._stt_worker(rec)
+        self.assertEqual(bot._stt_queue.get_nowait(), 'hello robot')
+        self.assertEqual(rec.AcceptWaveform.call_count, 2)
+        self.assertEqual(bot._audio_pool.qsize(), free)
+
+
+class TestTtsWorker(unittest.TestCase):
+    def test_close_plays_queued_speech(self):
+        bot = Chatbot(simulate=True)
+        spoken = []
+        bot.tts_engine = SimpleNamespace(say=spoken.append, runAndWait=lambda: time.sleep(0.02))
+        bot._tts_thread = threading.Thread(target=bot._tts_worker, daemon=True)
+        worker = bot._tts_thread
+        worker.start()
+        bot.speak('first')
+        bot.speak('last words')
+        bot.close_tts(timeout_s=2.0)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(spoken, ['first', 'last words'])
+
+
+class TestRateLimiter(unittest.TestCase):
+    def _limiter(self, rpm, tpm):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        return RateLimiter(rpm, tpm, clock=lambda: now[0], sleep=sleep), now
+
+    def test_requests_per_minute(self):
+        limiter, now = self._limiter(rpm=2, tpm=0)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertAlmostEqual(limiter.acquire(), 30.0)
+        self.assertAlmostEqual(now[0], 30.0)
+
+    def test_tokens_per_minute(self):
+        limiter, _ = self._limiter(rpm=0, tpm=600)
+        self.assertEqual(limiter.acquire(500), 0.0)
+        self.assertAlmostEqual(limiter.acquire(300), 20.0)
+
+    def test_env_limits_parsed_defensively(self):
+        with mock.patch.dict('os.environ', {'OPENAI_RPM': '60', 'OPENAI_TPM': 'lots'}):
+            self.assertEqual(chatbot._env_limit('OPENAI_RPM'), 60.0)
+            with self.assertLogs('src.chatbot', 'WARNING'):
+                self.assertEqual(chatbot._env_limit('OPENAI_TPM'), 0.0)
+        with mock.patch.dict('os.environ', {'OPENAI_RPM': '-5'}), self.assertLogs('src.chatbot', 'WARNING'):
+            self.assertEqual(chatbot._env_limit('OPENAI_RPM'), 0.0)
+        with mock.patch.dict('os.environ', {'CHATBOT_REPLY_CACHE_TTL': '5m'}), self.assertLogs('src.chatbot', 'WARNING'):
+            self.assertEqual(chatbot._env_limit('CHATBOT_REPLY_CACHE_TTL', 300.0), 300.0)
+
+    def test_unlimited_by_default(self):
+        limiter, _ = self._limiter(rpm=0, tpm=0)
+        self.assertEqual(sum(limiter.acquire(10_000) for _ in range(100)), 0.0)
+
+
+class TestReplyCache(unittest.TestCase):
+    def test_admits_on_second_miss(self):
+        cache = ReplyCache(max_entries=4, ttl_s=60.0)
+        key = ReplyCache.key('prompt', '  Hello ')
+        cache.put(key, 'hi')
+        self.assertIsNone(cache.get(key))
+        cache.put(key, 'hi')
+        self.assertEqual(cache.get(ReplyCache.key('prompt', 'hello')), 'hi')
+
+    def test_evicts_least_recent(self):
+        cache = ReplyCache(max_entries=1, ttl_s=60.0)
+        for text in ('a', 'a', 'b', 'b'):
+            cache.put(ReplyCache.key('p', text), text)
+        self.assertIsNone(cache.get(ReplyCache.key('p', 'a')))
+        self.assertEqual(cache.get(ReplyCache.key('p', 'b')), 'b')
+
+    def test_semantic_fallback_matches_near_duplicates(self):
+        vectors = {'wave': [1.0, 0.0], 'wave please': [0.99, 0.05], 'stop': [0.0, 1.0]}
+        cache = ReplyCache(ttl_s=60.0, embedder=vectors.__getitem__, similarity=0.9)
+        key = ReplyCache.key('p', 'wave', 'model')
+        cache.put(key, 'waving')
+        cache.put(key, 'waving')
+        self.assertEqual(cache.get(ReplyCache.key('p', 'wave please', 'model')), 'waving')
+        self.assertIsNone(cache.get(ReplyCache.key('p', 'stop', 'model')))
+        self.assertIsNone(cache.get(ReplyCache.key('p', 'wave please', 'other-model')))
+
+    @mock.patch.dict('os.environ', {'OPENAI_API_KEY': 'test'})
+    def test_control_commands_never_answered_from_similar_utterance(self):
+        vectors = {'turn left': [1.0, 0.0], 'turn right': [0.99, 0.05]}
+        replies = {
+            'turn left': '{"speech": "Left", "actions": [{"type": "movement", "value": "left"}]}',
+            'turn right': '{"speech": "Right", "actions": [{"type": "movement", "value": "right"}]}',
+        }
+
+        def create(**kwargs):
+            content = replies[kwargs['messages'][-1]['content']]
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        with mock.patch.object(chatbot, '_HAS_OPENAI', True), mock.patch.object(chatbot, '_HAS_OPENAI_V1', True), \
+                mock.patch.object(chatbot, '_OpenAIClient', object, create=True):
+            bot = Chatbot(simulate=True)
+            bot._reply_cache = ReplyCache(ttl_s=60.0, embedder=vectors.__getitem__, similarity=0.9)
+            bot._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+            for _ in range(2):
+                self.assertEqual(bot.generate_control_reply('turn left')['actions'][0]['value'], 'left')
+            self.assertEqual(bot.generate_control_reply('turn right')['actions'][0]['value'], 'right')
+
+    def test_zero_ttl_disables(self):
+        cache = ReplyCache(ttl_s=0.0)
+        key = ReplyCache.key('p', 'x')
+        cache.put(key, 'y')
+        cache.put(key, 'y')
+        self.assertIsNone(cache.get(key))
+
+
+class TestChatLoop(unittest.TestCase):
+    @mock.patch.dict('os.environ', {'OPENAI_API_KEY': ''})
+    def test_stdin_end_finishes_pending_reply(self):
+        bot = Chatbot(attitude='friendly', simulate=True, control_mode=True)
+        args = SimpleNamespace(control=True, simulate=True)
+        with mock.patch.object(bot, 'read_stdin_line', side_effect=['move forward', '', None]), \
+                mock.patch('builtins.print') as printed:
+            chatbot.asyncio.run(chatbot._chat_loop(bot, args, None))
+        output = [call.args[0] for call in printed.call_args_list if call.args]
+        self.assertIn('"forward"', output[-2])
+        self.assertEqual(output[-1], 'Goodbye')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from src.gesture_control import DEFAULT_GESTURES, GestureController
+from src.gesture_control import DEFAULT_GESTURES, Gesture, GestureController
 
 
 class TestGestureController(unittest.TestCase):
@@ -18,6 +18,29 @@ class TestGestureController(unittest.TestCase):
         self.assertAlmostEqual(right, -0.2, places=3)
         controller.close()
 
+    def test_newer_gesture_supersedes_queued(self):
+        controller = GestureController(simulate=True)
+        controller.perform('wave')
+        controller.perform('point').result(timeout=1.0)
+        self.assertEqual(controller.positions, DEFAULT_GESTURES['point'])
+        controller.close()
+        self.assertEqual(controller.positions, DEFAULT_GESTURES['rest'])
+
+    def test_flapping_requests_settle_on_majority(self):
+        controller = GestureController(simulate=True)
+        for gesture in ('wave', 'point', 'wave', 'nod'):
+            future = controller.perform(gesture)
+        future.result(timeout=1.0)
+        self.assertEqual(controller.positions, DEFAULT_GESTURES['wave'])
+        controller.close()
+
+    def test_enum_matches_named_gestures(self):
+        self.assertEqual({g.name.lower() for g in Gesture}, set(DEFAULT_GESTURES))
+        controller = GestureController(simulate=True)
+        controller.perform(Gesture.SALUTE).result(timeout=1.0)
+        self.assertEqual(controller.positions, DEFAULT_GESTURES['salute'])
+        controller.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -13,6 +13,21 @@ class TestGripperController(unittest.TestCase):
         controller.toggle()
         controller.close_controller()
 
+    def test_skips_unchanged_servo_writes(self):
+        controller = GripperController(pin=None, simulate=True)
+        controller.simulate = False
+        writes = []
+
+        class FakeServo:
+            def __setattr__(self, name, value):
+                writes.append(value)
+
+        controller._servo = FakeServo()
+        controller.close()
+        controller.close()
+        controller.open()
+        self.assertEqual(writes, [controller.close_value, controller.open_value])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,7 @@
+import threading
+import time
 import unittest
+from unittest import mock
 
 
 class TestLocalYoloClient(unittest.TestCase):
@@ -13,6 +16,162 @@ class TestLocalYoloClient(unittest.TestCase):
             with self.assertRaises(RuntimeError):
                 LocalYoloClient()
 
+    def test_export_is_kept_per_imgsz(self):
+        import tempfile
+        from pathlib import Path
+        from src import local_vision
+
+        exports = []
+
+        class FakeYolo:
+            def __init__(self, path, task=None):
+                self.path = path
+
+            def export(self, format, imgsz):
+                exports.append(imgsz)
+                out = Path(self.path[: -len('.pt')] + '.onnx')
+                out.write_text(str(imgsz))
+                return str(out)
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(local_vision, 'YOLO', FakeYolo):
+            weights = str(Path(tmp) / 'yolov8n.pt')
+            self.assertEqual(local_vision._load_model(weights, 'onnx', 320).path, str(Path(tmp) / 'yolov8n_320.onnx'))
+            local_vision._load_model(weights, 'onnx', 320)
+            self.assertEqual(local_vision._load_model(weights, 'onnx', 416).path, str(Path(tmp) / 'yolov8n_416.onnx'))
+            self.assertEqual(exports, [320, 416])
+            self.assertEqual((Path(tmp) / 'yolov8n_416.onnx').read_text(), '416')
+
+    def test_camera_feed_shared_until_last_release(self):
+        from src import local_vision
+
+        class FakeFeed:
+            instances = []
+
+            def __init__(self, camera_index, frame_size, fps):
+                self.frame_size = tuple(frame_size)
+                self.fps = fps
+                self.users = 0
+                self.released = False
+                FakeFeed.instances.append(self)
+
+            def release(self):
+                self.released = True
+
+        with mock.patch.object(local_vision, '_CameraFeed', FakeFeed), mock.patch.dict(local_vision._FEEDS, clear=True):
+            first = local_vision._acquire_feed(7, (640, 480), 15)
+            second = local_vision._acquire_feed(7, (640, 480), 15)
+            self.assertIs(first, second)
+            self.assertEqual(len(FakeFeed.instances), 1)
+            with self.assertLogs('src.local_vision', 'WARNING'):
+                self.assertIs(local_vision._acquire_feed(7, (320, 240), 15), first)
+            local_vision._release_feed(7)
+            local_vision._release_feed(7)
+            self.assertFalse(first.released)
+            local_vision._release_feed(7)
+            self.assertTrue(first.released)
+            self.assertNotIn(7, local_vision._FEEDS)
+
+    def test_model_load_runs_outside_shared_lock(self):
+        from src import local_vision
+
+        loading = threading.Event()
+        finish = threading.Event()
+
+        def slow_load(model_path, export_format, imgsz):
+            loading.set()
+            finish.wait(5)
+            return 'model'
+
+        results = []
+        with mock.patch.object(local_vision, '_load_model', side_effect=slow_load) as load, \
+                mock.patch.dict(local_vision._MODELS, clear=True):
+            loaders = [
+                threading.Thread(target=lambda: results.append(local_vision._shared_model('m.pt', 'onnx', 320)))
+                for _ in range(2)
+            ]
+            loaders[0].start()
+            self.assertTrue(loading.wait(5))
+            loaders[1].start()
+            # Feeds (and other clients' close()) are not held up by the export.
+            self.assertTrue(local_vision._SHARED_LOCK.acquire(timeout=1))
+            local_vision._SHARED_LOCK.release()
+            finish.set()
+            for thread in loaders:
+                thread.join(5)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(sorted(loaded_now for _, _, loaded_now in results), [False, True])
+        self.assertIs(results[0][1], results[1][1])
+
+    def test_background_detection_stops_when_idle(self):
+        from src import local_vision
+
+        class FakeFeed:
+            cap = None
+
+            def latest_frame(self):
+                return object()
+
+        inferences = []
+
+        def fake_detect(frame):
+            inferences.append(frame)
+            time.sleep(0.02)
+            return [{'label': 'frame'}]
+
+        with mock.patch.object(local_vision, 'YOLO', object()), \
+                mock.patch.object(local_vision, 'cv2', object()), \
+                mock.patch.object(local_vision, '_shared_model', return_value=(None, threading.Lock(), False)), \
+                mock.patch.object(local_vision, '_acquire_feed', return_value=FakeFeed()), \
+                mock.patch.object(local_vision, '_release_feed') as release:
+            client = local_vision.LocalYoloClient()
+            client._infer_period_s = 0.02
+            client._detect_frame = fake_detect
+            self.assertEqual(client.detect(), [{'label': 'frame'}])
+            deadline = time.monotonic() + 2.0
+            while client._infer_thread is not None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertIsNone(client._infer_thread)
+            # A single detect() costs about one inference period, not seconds of work.
+            self.assertLessEqual(len(inferences), 3)
+            client.close()
+            release.assert_called_once_with(0)
+
+    def test_unknown_class_id_falls_back_to_number(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy not installed')
+        from src import local_vision
+
+        class Tensor:
+            def __init__(self, values):
+                self.values = np.array(values, dtype=float)
+
+            def cpu(self):
+                return self
+
+            def numpy(self):
+                return self.values
+
+        class Boxes:
+            xyxy = Tensor([[0, 0, 10, 10], [10, 10, 20, 20]])
+            conf = Tensor([0.9, 0.8])
+            cls = Tensor([0, 7])
+
+            def __len__(self):
+                return 2
+
+        class Result:
+            boxes = Boxes()
+            names = {0: 'Coffee Mug'}
+
+        client = object.__new__(local_vision.LocalYoloClient)
+        client._label_names = None
+        client._labels = []
+        with mock.patch.object(local_vision, 'np', np):
+            detections = client._result_detections(Result(), np.zeros((20, 20, 3)))
+        self.assertEqual([d['label'] for d in detections], ['coffee_mug', '7'])
+
 
 if __name__ == '__main__':
     unittest.main()
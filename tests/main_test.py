@@ -0,0 +1,34 @@
+import os
+import unittest
+
+from src.chatbot import Chatbot
+from src.main import parse_pins, parse_tuning
+
+
+class TestMainParsing(unittest.TestCase):
+
+    def test_parse_pins(self):
+        self.assertEqual(parse_pins(['17', 18], 2, 'motor pins'), (17, 18))
+        with self.assertRaises(ValueError):
+            parse_pins([17], 2, 'motor pins')
+
+    def test_parse_tuning(self):
+        self.assertEqual(parse_tuning('speed_set:0.600'), ('speed_set', None, 0.6))
+        self.assertEqual(parse_tuning('trim_adj:left:+0.050'), ('trim_adj', 'left', 0.05))
+        self.assertEqual(parse_tuning('trim_reset'), ('trim_reset', None, 0.0))
+
+    def test_parse_tuning_rejects_malformed_values(self):
+        for value in ('speed_set', 'trim_adj:0.1', 'trim_reset:left', 'speed_set:fast', 'warp:1.0'):
+            self.assertIsNone(parse_tuning(value), value)
+
+    def test_chatbot_tuning_values_parse(self):
+        os.environ.pop('OPENAI_API_KEY', None)
+        bot = Chatbot(attitude='friendly', simulate=True, control_mode=True)
+        for text in ('Set speed to 0.6', 'Slow down a little', 'Trim left motor by 0.05', 'Reset trim please'):
+            for action in bot.generate_control_reply(text)['actions']:
+                if action['type'] == 'tuning':
+                    self.assertIsNotNone(parse_tuning(action['value']), action['value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
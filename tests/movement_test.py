@@ -1,6 +1,11 @@
 import unittest
 
-from src.movement import Movement
+from src.movement import SEQUENCE_ACTIONS, Movement
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - numpy optional
+    np = None
 
 
 class TestMovement(unittest.TestCase):
@@ -63,6 +68,42 @@ class TestMovement(unittest.TestCase):
         self.robot.reset_trim()
         self.assertEqual(self.robot.trim, (0.0, 0.0))
 
+    def test_single_side_trim(self):
+        self.robot.set_trim(0.2, -0.2)
+        self.robot.set_left_trim(0.3)
+        self.assertEqual(self.robot.trim, (0.3, -0.2))
+        self.robot.set_right_trim(0.9)
+        self.assertEqual(self.robot.trim, (0.3, 0.5))
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_simulate_sequence_matches_step_by_step(self):
+        self.robot.set_speed_scale(1.3)
+        self.robot.set_trim(0.1, -0.05)
+        self.robot.turn_right()
+        rows = [(0, 0.5), (2, 1.0), (0, 1.0), (1, 0.0), (3, 1.0), (3, 1.0), (1, 0.7), (4, 0.0), (0, 2.0)]
+        trajectory = self.robot.simulate_sequence(rows)
+        steps = {
+            'forward': self.robot.move_forward,
+            'backward': self.robot.move_backward,
+            'left': self.robot.turn_left,
+            'right': self.robot.turn_right,
+        }
+        for (code, speed), expected in zip(rows, trajectory):
+            action = SEQUENCE_ACTIONS[code]
+            if action == 'stop':
+                self.robot.stop()
+            else:
+                steps[action](speed)
+            self.assertEqual(len(expected), 2)
+            self.assertAlmostEqual(self.robot.position[0], expected[0])
+            self.assertAlmostEqual(self.robot.position[1], expected[1])
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_simulate_sequence_rejects_unknown_codes(self):
+        for code in (-1, len(SEQUENCE_ACTIONS)):
+            with self.assertRaises(ValueError):
+                self.robot.simulate_sequence([(0, 0.5), (code, 0.5)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,16 +1,22 @@
 import json
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from src import object_perception
 from src.object_perception import ObjectObservation, ObjectRecognizer
 
 
 class FakeRemoteVision:
     def __init__(self, payload):
         self.payload = payload
+        self.calls = 0
 
     def detect(self):
+        self.calls += 1
         return self.payload
 
 
@@ -48,6 +54,82 @@ class TestObjectPerception(unittest.TestCase):
         self.assertIsInstance(message, str)
         recognizer.close()
 
+    def test_remotes_fall_through_empty_results(self):
+        empty = FakeRemoteVision([])
+        remote = FakeRemoteVision([{'label': 'green cube', 'distance_cm': 20.0, 'angle_deg': 5.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_clients=[empty, remote])
+        obs = recognizer.observations()
+        recognizer.close()
+        self.assertEqual([o.label for o in obs], ['green_cube'])
+        self.assertEqual((empty.calls, remote.calls), (1, 1))
+
+    def test_quick_answer_skips_lower_priority_remotes(self):
+        yolo = FakeRemoteVision([{'label': 'red cube', 'distance_cm': 20.0}])
+        google = FakeRemoteVision([{'label': 'green cube', 'distance_cm': 20.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_clients=[yolo, google])
+        obs = recognizer.observations()
+        recognizer.close()
+        self.assertEqual([o.label for o in obs], ['red_cube'])
+        self.assertEqual((yolo.calls, google.calls), (1, 0))
+
+    def test_higher_priority_remote_wins_when_slower(self):
+        class SlowRemote(FakeRemoteVision):
+            def detect(self):
+                self.calls += 1
+                threading.Event().wait(0.1)
+                return self.payload
+
+        yolo = SlowRemote([{'label': 'red cube', 'distance_cm': 20.0}])
+        google = FakeRemoteVision([{'label': 'green cube', 'distance_cm': 20.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_clients=[yolo, google])
+        with mock.patch.object(object_perception, 'REMOTE_HEDGE_S', 0.01):
+            obs = recognizer.observations()
+        recognizer.close()
+        self.assertEqual([o.label for o in obs], ['red_cube'])
+        self.assertEqual((yolo.calls, google.calls), (1, 1))
+
+    def test_busy_remote_is_not_resubmitted(self):
+        release = threading.Event()
+
+        class SlowRemote(FakeRemoteVision):
+            def detect(self):
+                self.calls += 1
+                release.wait(5)
+                return self.payload
+
+        slow = SlowRemote([])
+        fast = FakeRemoteVision([{'label': 'green cube', 'distance_cm': 20.0, 'angle_deg': 5.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_clients=[slow, fast])
+        recognizer._remote_timeout_s = 0.2
+        with mock.patch.object(object_perception, 'OBSERVATION_COALESCE_S', 0.0), \
+                mock.patch.object(object_perception, 'REMOTE_HEDGE_S', 0.01):
+            self.assertEqual([o.label for o in recognizer.observations()], ['green_cube'])
+            recognizer.observations()
+        release.set()
+        recognizer.close()
+        self.assertEqual((slow.calls, fast.calls), (1, 2))
+
+    def test_stale_frame_is_rejected(self):
+        recognizer = ObjectRecognizer(simulate=True)
+        recognizer._grabber = object()  # pretend the grabber is already running
+        recognizer._latest_frame = 'frame'
+        recognizer._frame_ready.set()
+        recognizer._latest_frame_ts = time.monotonic()
+        self.assertEqual(recognizer._current_frame(), 'frame')
+        recognizer._latest_frame_ts = time.monotonic() - object_perception.FRAME_MAX_AGE_S - 1.0
+        self.assertIsNone(recognizer._current_frame())
+        recognizer._grabber = None
+        recognizer.close()
+
+    def test_back_to_back_requests_share_one_pass(self):
+        remote = FakeRemoteVision([{'label': 'red cube', 'distance_cm': 40.0, 'angle_deg': 30.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_client=remote)
+        self.assertIn('red', recognizer.describe('red cube'))
+        plan = recognizer.plan_grab('red_cube')
+        self.assertEqual(plan[-1], {'type': 'gripper', 'value': 'close'})
+        self.assertEqual(remote.calls, 1)
+        recognizer.close()
+
     def test_remote_integration(self):
         remote = FakeRemoteVision([
             {'label': 'purple ball', 'distance_cm': 42.0, 'angle_deg': -8.0},
@@ -59,6 +141,27 @@ class TestObjectPerception(unittest.TestCase):
         self.assertIn('purple', recognizer.describe('purple ball'))
         recognizer.close()
 
+    def test_prefetch_is_consumed_once(self):
+        remote = FakeRemoteVision([{'label': 'red cube', 'distance_cm': 20.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_client=remote)
+        recognizer.prefetch()
+        recognizer.prefetch()
+        self.assertEqual(recognizer.observations()[0].label, 'red_cube')
+        self.assertEqual(remote.calls, 1)
+        with mock.patch.object(object_perception, 'OBSERVATION_COALESCE_S', 0.0):
+            recognizer.observations()
+        self.assertEqual(remote.calls, 2)
+        recognizer.close()
+
+    def test_latest_observations_does_not_wait(self):
+        remote = FakeRemoteVision([{'label': 'green cube', 'distance_cm': 20.0, 'angle_deg': 5.0}])
+        recognizer = ObjectRecognizer(simulate=True, remote_client=remote)
+        self.assertEqual(recognizer.latest_observations(), [])
+        recognizer._prefetch[1].result(timeout=5)
+        self.assertEqual([obs.label for obs in recognizer.latest_observations()], ['green_cube'])
+        recognizer.close()
+        self.assertEqual(remote.calls, 2)
+
     def test_load_color_map(self):
         data = {
             'white_cube': {
@@ -92,6 +195,24 @@ class TestObjectPerception(unittest.TestCase):
         self.assertEqual(recognizer.resolve_label('pink blossom'), 'pink_flower')
         recognizer.close()
 
+    def test_resolve_label_cache_follows_color_map_updates(self):
+        recognizer = ObjectRecognizer(simulate=True)
+        self.assertIsNone(recognizer.resolve_label('teal kettle'))
+        with mock.patch.object(recognizer, '_resolve_label_uncached', wraps=recognizer._resolve_label_uncached) as uncached:
+            self.assertIsNone(recognizer.resolve_label('teal kettle'))
+            uncached.assert_not_called()
+        recognizer.update_color_map({'teal_kettle': {'h': (80, 95), 's': (80, 255), 'v': (60, 255)}})
+        self.assertEqual(recognizer.resolve_label('teal kettle'), 'teal_kettle')
+        recognizer.close()
+
+    @unittest.skipIf(object_perception.np is None, 'numpy not installed')
+    def test_hsv_bounds_precomputed(self):
+        loaded = ObjectRecognizer._normalise_color_map({'red_cup': {'h': (170, 190), 's': (-5, 255), 'v': (90, 300)}})
+        hsv_range = loaded['red_cup']['ranges'][0]
+        self.assertEqual(hsv_range['lower'].tolist(), [170, 0, 90])
+        self.assertEqual(hsv_range['upper'].tolist(), [190, 255, 255])
+        self.assertEqual(hsv_range['lower'].dtype, object_perception.np.uint8)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import threading
 import unittest
 
 from src.battery_check import BatteryMonitor, BatteryConfig
@@ -20,6 +21,15 @@ class TestSafeShutdown(unittest.TestCase):
         status = handler.check_once()
         self.assertEqual(status, 'low')
 
+    def test_cancel_wakes_monitor_loop(self):
+        monitor = BatteryMonitor(lambda: 12.5, config=BatteryConfig(critical_voltage=10.0, warn_voltage=11.5))
+        handler = SafeShutdown(monitor, simulate=True)
+        thread = threading.Thread(target=handler.monitor_loop, kwargs={'interval_s': 60.0}, daemon=True)
+        thread.start()
+        handler.cancel()
+        thread.join(timeout=1.0)
+        self.assertFalse(thread.is_alive())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from src.utils.servo import PigpioServo
+
+
+class FakePi:
+
+    def __init__(self):
+        self.writes = []
+
+    def set_servo_pulsewidth(self, pin, pulse_width):
+        self.writes.append((pin, pulse_width))
+
+
+class TestPigpioServo(unittest.TestCase):
+
+    def test_values_map_to_pulse_widths(self):
+        pi = FakePi()
+        servo = PigpioServo(pi, 18)
+        servo.value = 1.0
+        servo.value = -0.5
+        servo.close()
+        self.assertEqual(pi.writes, [(18, 1500), (18, 2000), (18, 1250), (18, 0)])
+        self.assertEqual(servo.value, -0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import queue
 import unittest
 
 from src.voice import Voice
@@ -141,6 +142,22 @@ class TestVoice(unittest.TestCase):
         self.assertEqual(engine.props['rate'], 90)
         self.assertEqual(engine.props['volume'], 0.5)
 
+    def test_background_listen_queues_utterances(self):
+        voice = Voice(
+            simulate=False,
+            recognizer=FakeRecognizer(),
+            microphone=FakeMicrophone(),
+            tts_engine=FakeEngine(),
+            auto_calibrate=False,
+        )
+        utterances = queue.Queue()
+        self.assertTrue(voice.start_background_listen(utterances, timeout=1.0))
+        try:
+            self.assertEqual(utterances.get(timeout=1.0), "google:en-US:audio")
+        finally:
+            voice.stop_background_listen()
+        self.assertFalse(Voice(simulate=True).start_background_listen(utterances))
+
 
 
 if __name__ == '__main__':
@@ -1,5 +1,7 @@
 import unittest
+from unittest import mock
 
+from src.sensors import DistanceSensorWrapper
 from src.wall_guard import WallGuard
 
 
@@ -31,6 +33,19 @@ class TestWallGuard(unittest.TestCase):
         self.assertTrue(guard.allows_forward())   # 27 -> resume
         guard.close()
 
+    def test_shared_sensor_reuses_fresh_reading(self):
+        sensor = DistanceSensorWrapper(simulate=True, max_age_s=60.0)
+        sensor.set_simulated_distance(30)
+        guard = WallGuard(sensor, stop_threshold_cm=20, resume_threshold_cm=25)
+        with mock.patch.object(sensor._sensor, 'read_distance_cm', wraps=sensor._sensor.read_distance_cm) as read:
+            self.assertTrue(guard.allows_forward())
+            self.assertEqual(sensor.distance_cm, 30)
+            self.assertEqual(read.call_count, 1)
+            sensor.set_simulated_distance(10)
+            self.assertFalse(guard.allows_forward())
+            self.assertEqual(read.call_count, 2)
+        guard.close()
+
 
 if __name__ == '__main__':
     unittest.main()